@@ -0,0 +1,88 @@
+"""
+Compare sheet generation throughput when writing synchronously (makedirs and
+write inline after every render) against the background SheetWriter, on a
+slow-filesystem stand-in where every directory and file write pays a fixed
+latency, as on a network-mounted output share.
+
+    python benchmark_writer.py [--latency-ms 40] [--athletes 10] [--workers 2]
+"""
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+import generate_workouts as gw
+from program_loader import load_program
+
+
+def slow_filesystem(latency):
+    """Patch directory creation and PDF writes to sleep `latency` seconds each."""
+    real_makedirs = os.makedirs
+    real_write = gw.write_pdf_file
+
+    def slow_makedirs(*args, **kwargs):
+        time.sleep(latency)
+        return real_makedirs(*args, **kwargs)
+
+    def slow_write(path, data):
+        time.sleep(latency)
+        return real_write(path, data)
+
+    os.makedirs = slow_makedirs
+    gw.write_pdf_file = slow_write
+
+    def restore():
+        os.makedirs = real_makedirs
+        gw.write_pdf_file = real_write
+    return restore
+
+
+def run(athletes, program, output_dir, writer):
+    started = time.perf_counter()
+    sheets = 0
+    for athlete in athletes:
+        for meso in program['mesocycles']:
+            gw.build_phase_pdf(athlete, meso, program, output_dir, writer=writer)
+            sheets += 1
+    if writer is not None:
+        writer.close()
+    return sheets, time.perf_counter() - started
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--latency-ms', type=float, default=40.0,
+                        help="simulated latency per directory/file operation (default: 40)")
+    parser.add_argument('--athletes', type=int, default=10)
+    parser.add_argument('--workers', type=int, default=2, help="SheetWriter threads")
+    args = parser.parse_args(argv)
+
+    program = load_program()
+    template = gw.load_athletes('athlete_testing_example.csv')
+    athletes = [
+        {'name': f"Athlete {i}", 'maxes': template[i % len(template)]['maxes']}
+        for i in range(args.athletes)
+    ]
+
+    # Warm the program, style and logo caches so both runs measure the same work
+    gw.render_sheet(program['title'], '', [], 4, gw.LOGO_FILE)
+
+    restore = slow_filesystem(args.latency_ms / 1000.0)
+    tmp = tempfile.mkdtemp(prefix='writer_bench_')
+    try:
+        sync_sheets, sync_s = run(athletes, program, os.path.join(tmp, 'sync'), None)
+        writer = gw.SheetWriter(workers=args.workers)
+        bg_sheets, bg_s = run(athletes, program, os.path.join(tmp, 'background'), writer)
+    finally:
+        restore()
+        shutil.rmtree(tmp, ignore_errors=True)
+
+    print(f"latency {args.latency_ms:.0f} ms/op, {sync_sheets} sheets")
+    print(f" synchronous : {sync_s:6.2f}s  {sync_sheets / sync_s:6.1f} sheets/s")
+    print(f" background  : {bg_s:6.2f}s  {bg_sheets / bg_s:6.1f} sheets/s")
+    print(f" speedup     : {sync_s / bg_s:6.2f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,8 +1,16 @@
-import pandas as pd
-import random
+import argparse
+import hashlib
+import io
+import json
+import multiprocessing
 import os
+import struct
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from reportlab.lib.pagesizes import letter, landscape
+from reportlab.lib.pagesizes import letter, landscape, A4
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch
 from reportlab.platypus import (
@@ -13,7 +21,13 @@ from reportlab.platypus import (
     Spacer,
     Image,
 )
+import reportlab
 from reportlab.lib import colors
+from PIL import Image as PILImage
+
+from program_loader import load_program, ProgramError
+from roster import load_athletes, safe_name
+from history import HISTORY_DIR, HistoryError, load_snapshot
 
 # =========================
 # COLORS
@@ -33,168 +47,45 @@ ROW_BG_MED = colors.white # alternate with white
 TESTING_DATA_FILE = 'athlete_testing.csv'
 OUTPUT_DIR = 'output'
 LOGO_FILE = 'phs_football_logo.png'
-
-MESOCYCLES = [
-    {
-        'name': 'Phase 1',
-        'start_date': datetime(2026, 1, 5),
-        'weeks': 4,
-        'main_intensity_min': 0.60,
-        'main_intensity_max': 0.75,
-        'main_reps': '8–10',
-        'main_sets': '3',
-    },
-    {
-        'name': 'Phase 2',
-        'start_date': datetime(2026, 2, 2),
-        'weeks': 4,
-        'main_intensity_min': 0.70,
-        'main_intensity_max': 0.80,
-        'main_reps': '6–8',
-        'main_sets': '3',
-    },
-    {
-        'name': 'Phase 3',
-        'start_date': datetime(2026, 3, 2),
-        'weeks': 4,
-        'main_intensity_min': 0.80,
-        'main_intensity_max': 0.90,
-        'main_reps': '3–5',
-        'main_sets': '4',
-    },
-]
+LOGO_PRINT_DPI = 300 # logos are downsampled to this before embedding
+RENDER_CACHE_DIR = '.render_cache'
+RENDER_CACHE_MAX_BYTES = 256 * 1024 * 1024
+RENDER_TEMPLATE_VERSION = 2 # bump whenever sheet layout or styling changes
+PDF_CREATOR = 'mesocycle-calc'
+# Fixed creation dates and content-derived document IDs, so identical input
+# gives byte-identical PDFs run after run (see golden_hashes.py)
+DETERMINISTIC_PDF = True
 
 # =========================
-# ACCESSORY INTENSITY BY PHASE
+# PAGE PROFILES
 # =========================
-# Multiplier applied to exercise 'factor' based on phase rep range
-# This makes accessories progress with volume/intensity like main lifts
+# Sheets are laid out at their letter-landscape size below and scaled down
+# as needed to fit each profile's page. 'suffix' is added to file names of
+# that format ('' keeps the plain name).
 
-ACCESSORY_INTENSITY = {
-    0: 0.65,  # Phase 1: 8-10 reps (higher volume = lower intensity)
-    1: 0.75,  # Phase 2: 6-8 reps
-    2: 0.90,  # Phase 3: 3-5 reps (lower volume = higher intensity)
+PAGE_PROFILES = {
+    'letter': {'pagesize': landscape(letter), 'margin': 0.25*inch, 'suffix': ''},
+    'a4': {'pagesize': landscape(A4), 'margin': 0.25*inch, 'suffix': 'A4'},
+    'pocket': {'pagesize': landscape((5.5*inch, 8.5*inch)), 'margin': 0.15*inch, 'suffix': 'Pocket'},
 }
+DEFAULT_PROFILES = ('letter',)
 
-MAIN_LIFTS = {
-    'Monday': 'Back Squat',
-    'Tuesday': 'Bench Press',
-    'Wednesday': 'Deadlift',
-    'Thursday': 'Standing Military Press',
-}
-
-MAIN_LIFT_MAXES = {
-    'Back Squat': 'Back Squat',
-    'Bench Press': 'Bench Press',
-    'Deadlift': 'Deadlift',
-    'Standing Military Press': 'Shoulder Press',
-}
-
-# Guaranteed accessories that always appear (not randomly selected)
-# Tuesday Phase 1 & 2: Bench Press (main), TRX Rows, Cable Pushdowns, DB Incline Bench
-GUARANTEED_ACCESSORIES = {
-    'Thursday': [
-        {'name': 'Push Press', 'ref_max': 'Shoulder Press','factor': 1.15, 'is_push_press': True},
-    ]
-}
-
-# Phase-specific guaranteed accessories for Tuesday (Phase 1 & 2 only)
-# TRX Rows counts as both guaranteed AND the bodyweight exercise
-TUESDAY_PHASE_1_2_GUARANTEED = [
-    {'name': 'TRX Rows (failure)', 'ref_max': None, 'factor': None},
-    {'name': 'Cable Pushdowns', 'ref_max': 'Bench Press', 'factor': 0.25},
-    {'name': 'DB Incline Bench', 'ref_max': 'Bench Press', 'factor': 0.60},
-]
-
-# Days with guaranteed accessories need fewer random accessories
-RANDOM_ACCESSORY_COUNT = {
-    'Monday': 3,
-    'Tuesday': 3,  # Phase 1 & 2: only guaranteed exercises; Phase 3: 1 main + 3 random = 4 total
-    'Wednesday': 3,
-    'Thursday': 2,  # 1 main + 1 guaranteed + 2 random = 4 total
-}
-
-BODYWEIGHT_EXERCISES = {
-    'Push-ups (failure)', 'Dips (failure)', 'TRX Rows (failure)',
-    'Glute-Ham Raise (failure)', 'Hanging Leg Raises (failure)',
-    'Dead Arm Hang (failure)', 'Reverse Hyperext (failure)'
-}
-
-# Day-specific bodyweight exercise pools
-BODYWEIGHT_BY_DAY = {
-    'Monday': ['Glute-Ham Raise (failure)', 'Hanging Leg Raises (failure)'],
-    'Tuesday': ['Push-ups (failure)', 'TRX Rows (failure)'],
-    'Wednesday': ['Reverse Hyperext (failure)', 'Hanging Leg Raises (failure)'],
-    'Thursday': ['Dead Arm Hang (failure)'],
-}
-
-EXERCISE_POOLS = {
-    'Monday': [
-        {'name': 'Back Squat', 'ref_max': 'Back Squat', 'factor': None}, # main lift
-        {'name': 'Front Squat', 'ref_max': 'Back Squat', 'factor': 0.85},
-        {'name': 'Goblet Squat', 'ref_max': 'Back Squat', 'factor': 0.30},
-        {'name': 'Split Squat', 'ref_max': 'Back Squat', 'factor': 0.35},
-        {'name': 'Walking Lunges', 'ref_max': 'Back Squat', 'factor': 0.30},
-        {'name': 'Lateral Lunges', 'ref_max': 'Back Squat', 'factor': 0.25},
-        {'name': 'Step-ups', 'ref_max': 'Back Squat', 'factor': 0.30},
-        {'name': 'Leg Press', 'ref_max': 'Back Squat', 'factor': 0.80},
-        {'name': 'Glute Bridge', 'ref_max': 'Deadlift', 'factor': 0.70},
-        {'name': 'Glute-Ham Raise (failure)', 'ref_max': 'Deadlift', 'factor': 0.10}, # BW exercise
-        {'name': 'Hamstring Curl', 'ref_max': 'Deadlift', 'factor': 0.30},
-        {'name': 'Calf Raises', 'ref_max': 'Back Squat', 'factor': 0.40},
-    ],
-    'Tuesday': [
-        {'name': 'Bench Press', 'ref_max': 'Bench Press','factor': None}, # main lift
-        {'name': 'Close-Grip Bench', 'ref_max': 'Bench Press','factor': 0.90},
-        {'name': 'DB Flat Bench', 'ref_max': 'Bench Press','factor': 0.60},
-        {'name': 'DB Incline Bench', 'ref_max': 'Bench Press','factor': 0.60},
-        {'name': 'Push-ups (failure)', 'ref_max': None, 'factor': None}, # BW exercise
-        {'name': 'Barbell Row', 'ref_max': 'Bench Press','factor': 0.80},
-        {'name': 'DB Row', 'ref_max': 'Bench Press','factor': 0.40},
-        {'name': 'Skullcrushers', 'ref_max': 'Bench Press','factor': 0.30},
-        {'name': 'Cable Pushdowns', 'ref_max': 'Bench Press','factor': 0.25},
-        {'name': 'Face Pulls', 'ref_max': 'Bench Press','factor': 0.20},
-        {'name': 'Bicep Curls', 'ref_max': 'Bench Press','factor': 0.25},
-        {'name': 'Pallof Press', 'ref_max': 'Bench Press','factor': 0.25},
-        {'name': 'TRX Rows (failure)', 'ref_max': None, 'factor': None}, # BW exercise
-    ],
-    'Wednesday': [
-        {'name': 'Deadlift', 'ref_max': 'Deadlift', 'factor': None}, # main lift
-        {'name': 'Trap-Bar Deadlift', 'ref_max': 'Deadlift', 'factor': 0.90},
-        {'name': 'Romanian Deadlift', 'ref_max': 'Deadlift', 'factor': 0.60},
-        {'name': 'Single-Leg RDL', 'ref_max': 'Deadlift', 'factor': 0.35},
-        {'name': 'Good Mornings', 'ref_max': 'Back Squat', 'factor': 0.40},
-        {'name': 'Bulgarian Split Squat', 'ref_max': 'Back Squat', 'factor': 0.35},
-        {'name': 'Leg Curl', 'ref_max': 'Deadlift', 'factor': 0.30},
-        {'name': 'Reverse Hyperext (failure)', 'ref_max': None, 'factor': None}, # BW exercise
-        {'name': 'Hanging Leg Raises (failure)', 'ref_max': None, 'factor': None},
-    ],
-    'Thursday': [
-        {'name': 'Standing Military Press', 'ref_max': 'Shoulder Press','factor': None}, # main lift
-        {'name': 'DB Shoulder Press', 'ref_max': 'Shoulder Press','factor': 0.75},
-        {'name': 'Single-Arm Landmine Press', 'ref_max': 'Shoulder Press','factor': 0.60},
-        {'name': 'Dead Arm Hang (failure)', 'ref_max': None, 'factor': None}, # BW exercise
-        {'name': 'Lat Pulldown', 'ref_max': 'Bench Press', 'factor': 0.65},
-        {'name': 'Lateral Raises', 'ref_max': 'Shoulder Press','factor': 0.35},
-        {'name': 'Rear Delt Flyes', 'ref_max': 'Shoulder Press','factor': 0.35},
-        {'name': 'Upright Rows', 'ref_max': 'Shoulder Press','factor': 0.35},
-        {'name': 'Shrugs', 'ref_max': 'Deadlift', 'factor': 0.30},
-        {'name': 'Pallof Press', 'ref_max': 'Bench Press', 'factor': 0.25},
-    ],
-}
+# Layout at scale 1 (letter landscape)
+FRAME_PADDING = 6 # points SimpleDocTemplate's frame keeps inside the margins
+LOGO_SIZE = 1.0*inch
+HEADER_COL_WIDTHS = [2.0*inch, 5.7*inch, 2.0*inch]
+HEADER_HEIGHT = 1.10*inch
+HEADER_GAP = 0.4*inch
+EXERCISE_COL_WIDTH = 1.8*inch
+TARGET_COL_WIDTH = 1.3*inch
+REPS_COL_WIDTH = 0.8*inch
+ROW_HEIGHT = 0.30*inch
+DAY_BAR_HEIGHT = 0.25*inch
 
 # =========================
 # HELPERS
 # =========================
 
-def parse_max(max_str):
-    if pd.isna(max_str) or max_str == 'N/A' or max_str == '':
-        return None
-    max_str = str(max_str).strip()
-    import re
-    m = re.search(r'(\d+(?:\.\d+)?)', max_str)
-    return float(m.group(1)) if m else None
-
 def calculate_target_weight(max_weight, factor, round_to=5):
     if max_weight is None or factor is None:
         return None
@@ -212,183 +103,185 @@ def get_accessory_reps(mesocycle):
     """Return rep range for accessories based on mesocycle."""
     return mesocycle['main_reps']
 
-def load_athletes(filename):
-    if not os.path.exists(filename):
-        print(f"Error: {filename} not found.")
-        return []
-    df = pd.read_csv(filename)
-    athletes = []
-    for _, row in df.iterrows():
-        athletes.append({
-            'name': row['Name'],
-            'maxes': {
-                'Back Squat': parse_max(row.get('Squat')), # CSV column name
-                'Bench Press': parse_max(row.get('Bench Press')),
-                'Deadlift': parse_max(row.get('Deadlift')),
-                'Shoulder Press': parse_max(row.get('Shoulder Press')),
-            }
-        })
-    return athletes
-
 def build_bold_target(text_before_at, weight_str):
     """Return HTML string with weight/BW bolded after '@'."""
     # text_before_at is like "3×10 @"
     html = f"{text_before_at} <b>{weight_str}</b>"
     return html
 
-def choose_phase_accessories_unique(phase_index, mesocycle):
+# =========================
+# TARGET CALCULATION
+# =========================
+
+def resolve_target_text(row, maxes, mesocycle, wk):
+    """Return the target cell text for one layout row in week `wk`."""
+    sets = mesocycle['main_sets']
+    
+    if row['kind'] == 'main':
+        main_max = maxes.get(row['max_key'])
+        if main_max:
+            intensity = get_phase_intensity(mesocycle, wk)
+            tw = calculate_target_weight(main_max, intensity)
+            return build_bold_target(f"{sets}×{mesocycle['main_reps']} @", f"{int(tw)} lbs")
+        return f"{sets}×{mesocycle['main_reps']} @ ______"
+    
+    acc = row['spec']
+    accessory_reps = get_accessory_reps(mesocycle)
+    
+    if row['kind'] == 'accessory':
+        if row['is_bodyweight']:
+            # Bodyweight exercises don't scale with weight progression
+            return "3 sets @ BW"
+        if not (acc['ref_max'] and acc['factor']):
+            # No ref_max or factor - bodyweight or unweighted
+            return f"{sets} sets @ ______"
+    elif not (acc['ref_max'] and acc['factor']):
+        return f"{sets}×{accessory_reps} @ ______"
+    
+    ref_max = maxes.get(acc['ref_max'])
+    if not ref_max:
+        return f"{sets}×{accessory_reps} @ ______"
+    
+    if acc.get('is_push_press'):
+        # Push Press: 115% of strict press training weight with progression
+        strict_press_intensity = get_phase_intensity(mesocycle, wk)
+        strict_press_training = calculate_target_weight(ref_max, strict_press_intensity, round_to=5)
+        tw = calculate_target_weight(strict_press_training, 1.15, round_to=5)
+    else:
+        # Standard accessory: apply phase intensity multiplier and within-phase progression
+        acc_intensity = mesocycle['accessory_intensity']
+        adjusted_factor = acc['factor'] * acc_intensity
+        phase_progression = get_phase_intensity(mesocycle, wk)
+        final_factor = adjusted_factor * (phase_progression / mesocycle['accessory_intensity'])
+        tw = calculate_target_weight(ref_max, final_factor, round_to=5)
+    return build_bold_target(f"{sets}×{accessory_reps} @", f"{int(tw)} lbs")
+
+def compute_phase_targets(maxes, mesocycle, program):
     """
-    Choose accessories for the whole phase with no repeats across days.
-    Ensures one bodyweight exercise per day and guarantees specific exercises for Tuesday in Phase 1 & 2.
-    Returns dict: day -> list of accessory dicts (number varies by day).
+    Resolve every target cell of a phase for the given maxes.
+    Returns list of (day_name, day_label, [(row, [week 1 text, ...]), ...]).
     """
-    random.seed(100 + phase_index)
-    phase_name = mesocycle['name']
-    
-    # Flat pool of all accessories tagged by day, excluding main lifts
-    flat_pool = []
-    for day, exercises in EXERCISE_POOLS.items():
-        for e in exercises:
-            if e['factor'] is None and e['ref_max'] in MAIN_LIFT_MAXES.values():
-                continue # skip main lift entries
-            flat_pool.append((day, e))
-    
-    # Shuffle to randomize global accessory order
-    random.shuffle(flat_pool)
-    
-    per_day = {d: [] for d in ['Monday', 'Tuesday', 'Wednesday', 'Thursday']}
-    used_names = set()
-    
-    # First pass: add phase-specific guaranteed exercises and bodyweight exercises
-    for day in per_day.keys():
-        # For Tuesday in Phase 1 and Phase 2, add guaranteed exercises
-        if day == 'Tuesday' and phase_name in ['Phase 1', 'Phase 2']:
-            for guaranteed_ex in TUESDAY_PHASE_1_2_GUARANTEED:
-                per_day[day].append(guaranteed_ex)
-                used_names.add(guaranteed_ex['name'])
-        else:
-            # For all other days/phases, add one bodyweight exercise from the day's available pool
-            if day in BODYWEIGHT_BY_DAY:
-                available_bw = [e for day_tag, e in flat_pool 
-                               if day_tag == day and e['name'] in BODYWEIGHT_BY_DAY[day] 
-                               and e['name'] not in used_names]
-                if available_bw:
-                    bw_exercise = random.choice(available_bw)
-                    per_day[day].append(bw_exercise)
-                    used_names.add(bw_exercise['name'])
-    
-    # Second pass: fill remaining slots with random non-bodyweight exercises
-    for day in per_day.keys():
-        target_count = RANDOM_ACCESSORY_COUNT[day]
-        
-        # Count guaranteed exercises
-        guaranteed_count = len(GUARANTEED_ACCESSORIES.get(day, []))
-        if day == 'Tuesday' and phase_name in ['Phase 1', 'Phase 2']:
-            guaranteed_count = len(TUESDAY_PHASE_1_2_GUARANTEED)
-        
-        # For Tuesday Phase 1 & 2, no random accessories needed (already at 4 total)
-        if day == 'Tuesday' and phase_name in ['Phase 1', 'Phase 2']:
+    weeks = range(1, mesocycle['weeks'] + 1)
+    return [
+        (day_name, day_label, [
+            (row, [resolve_target_text(row, maxes, mesocycle, wk) for wk in weeks])
+            for row in rows
+        ])
+        for day_name, day_label, rows in program['layouts'][mesocycle['index']]
+    ]
+
+def recalculate_targets(maxes, changes, program):
+    """
+    What-if edit: recompute only the cells that depend on the changed maxes.
+    `maxes` is an athlete's current maxes dict and `changes` maps max keys to
+    new values (None clears a max). Neither is modified.
+    Returns dict: (phase_name, day_name, exercise, week) -> (old_text, new_text),
+    containing only cells whose text actually changes.
+    Raises KeyError for a key that is not one of the program's max keys.
+    """
+    max_keys = set(program['main_lift_maxes'].values())
+    unknown = [key for key in changes if key not in max_keys]
+    if unknown:
+        raise KeyError(f"unknown max key(s) {', '.join(map(repr, unknown))} "
+                       f"(expected one of {', '.join(sorted(max_keys))})")
+    index = program['dependency_index']
+    new_maxes = dict(maxes)
+    new_maxes.update(changes)
+    
+    delta = {}
+    for max_key, new_value in changes.items():
+        if maxes.get(max_key) == new_value:
             continue
-        
-        bw_count = sum(1 for acc in per_day[day] if acc['name'] in BODYWEIGHT_EXERCISES)
-        needed = target_count - guaranteed_count - bw_count
-        
-        for day_tag, ex in flat_pool:
-            if day_tag != day:
-                continue
-            if ex['name'] in used_names:
-                continue
-            if ex['name'] in BODYWEIGHT_EXERCISES:
-                continue  # Skip bodyweight exercises in this pass
-            per_day[day].append(ex)
-            used_names.add(ex['name'])
-            if len(per_day[day]) >= target_count:
-                break
-    
-    # Fallback: if any day still needs exercises, allow repeats
-    for day in per_day.keys():
-        target_count = RANDOM_ACCESSORY_COUNT[day]
-        while len(per_day[day]) < target_count:
-            remaining = [ex for d, ex in flat_pool if d == day]
-            if not remaining:
-                break
-            ex = random.choice(remaining)
-            per_day[day].append(ex)
-    
-    return per_day
+        for meso, day_name, row, wk in index.get(max_key, ()):
+            old_txt = resolve_target_text(row, maxes, meso, wk)
+            new_txt = resolve_target_text(row, new_maxes, meso, wk)
+            if old_txt != new_txt:
+                delta[(meso['name'], day_name, row['name'], wk)] = (old_txt, new_txt)
+    return delta
 
 # =========================
 # PDF BUILDING
 # =========================
 
-def build_phase_pdf(athlete, mesocycle):
-    phase_name = mesocycle['name']
-    phase_start = mesocycle['start_date']
-    weeks = mesocycle['weeks']
-    phase_end = phase_start + timedelta(days=weeks * 7 - 1)
-    
-    safe_name = athlete['name'].replace(' ', '_')
-    athlete_dir = os.path.join(OUTPUT_DIR, safe_name)
-    os.makedirs(athlete_dir, exist_ok=True)
-    
-    pdf_filename = os.path.join(
-        athlete_dir,
-        f"{safe_name}_{phase_name.replace(' ', '')}.pdf"
-    )
-    
-    doc = SimpleDocTemplate(
-        pdf_filename,
-        pagesize=landscape(letter),
-        topMargin=0.25 * inch,
-        bottomMargin=0.25 * inch,
-        leftMargin=0.25 * inch,
-        rightMargin=0.25 * inch,
-    )
-    
-    story = []
-    styles = getSampleStyleSheet()
-    
-    # ---------- HEADER ----------
-    
-    if os.path.exists(LOGO_FILE):
-        left_logo = Image(LOGO_FILE, width=1.0*inch, height=1.0*inch)
-        right_logo = Image(LOGO_FILE, width=1.0*inch, height=1.0*inch)
+# Built once per process and shared by every sheet
+_STYLES = {} # scale -> styles
+_LOGO_CACHE = {} # logo path -> print-resolution PNG bytes (None if missing)
+
+def get_styles(scale=1.0):
+    """Return the paragraph styles used on every sheet at `scale` (built on first use)."""
+    if scale not in _STYLES:
+        styles = getSampleStyleSheet()
+        _STYLES[scale] = {
+            'normal': styles['Normal'],
+            'title': ParagraphStyle(
+                'TitleLarge',
+                parent=styles['Heading1'],
+                fontSize=20*scale,
+                leading=22*scale,
+                alignment=1,
+                fontName='Helvetica-Bold',
+                spaceAfter=4*scale,
+            ),
+            'info': ParagraphStyle(
+                'Info',
+                parent=styles['Normal'],
+                fontSize=12*scale,
+                leading=14*scale,
+                alignment=1,
+                fontName='Helvetica-Bold',
+            ),
+            'cell': ParagraphStyle(
+                'Cell',
+                parent=styles['Normal'],
+                fontSize=8*scale,
+                leading=9*scale,
+                alignment=1,
+            ),
+        }
+    return _STYLES[scale]
+
+def load_logo(logo_file):
+    """
+    Return the logo as PNG bytes downsampled to LOGO_PRINT_DPI at its printed
+    size, or None if the file is missing. Decoding and re-encoding the full
+    resolution source dominated render time, so it happens once per path.
+    """
+    if logo_file not in _LOGO_CACHE:
+        png = None
+        if os.path.exists(logo_file):
+            with PILImage.open(logo_file) as im:
+                im.load()
+                size = int(LOGO_PRINT_DPI * LOGO_SIZE / inch)
+                im.thumbnail((size, size), PILImage.LANCZOS)
+                buf = io.BytesIO()
+                im.save(buf, format='PNG')
+                png = buf.getvalue()
+        _LOGO_CACHE[logo_file] = png
+    return _LOGO_CACHE[logo_file]
+
+def build_header(title, info_text, logo_file, scale=1.0):
+    """Return the header flowables: logo | title + info line | logo."""
+    styles = get_styles(scale)
+    
+    logo_png = load_logo(logo_file)
+    if logo_png:
+        logo_size = LOGO_SIZE * scale
+        left_logo = Image(io.BytesIO(logo_png), width=logo_size, height=logo_size)
+        right_logo = Image(io.BytesIO(logo_png), width=logo_size, height=logo_size)
     else:
-        left_logo = Paragraph(" ", styles['Normal'])
-        right_logo = Paragraph(" ", styles['Normal'])
-    
-    title_style = ParagraphStyle(
-        'TitleLarge',
-        parent=styles['Heading1'],
-        fontSize=20,
-        leading=22,
-        alignment=1,
-        fontName='Helvetica-Bold',
-        spaceAfter=4,
-    )
-    
-    date_range_str = f"{phase_start.strftime('%b %d')} – {phase_end.strftime('%b %d, %Y')}"
-    info_text = f"{athlete['name']} | {phase_name} | {date_range_str}"
-    
-    info_style = ParagraphStyle(
-        'Info',
-        parent=styles['Normal'],
-        fontSize=12,
-        leading=14,
-        alignment=1,
-        fontName='Helvetica-Bold',
-    )
+        left_logo = Paragraph(" ", styles['normal'])
+        right_logo = Paragraph(" ", styles['normal'])
     
     center_cell = [
-        Paragraph("PHS FOOTBALL POWER PROGRAM", title_style),
-        Paragraph(info_text, info_style),
+        Paragraph(title, styles['title']),
+        Paragraph(info_text, styles['info']),
     ]
     
     header_row = [[left_logo, center_cell, right_logo]]
     header_table = Table(
         header_row,
-        colWidths=[2.0*inch, 5.7*inch, 2.0*inch],
-        rowHeights=[1.10*inch],
+        colWidths=[w * scale for w in HEADER_COL_WIDTHS],
+        rowHeights=[HEADER_HEIGHT * scale],
     )
     
     header_table.setStyle(TableStyle([
@@ -399,36 +292,22 @@ def build_phase_pdf(athlete, mesocycle):
         ('BOX', (0, 0), (-1, -1), 0, colors.white),
     ]))
     
-    story.append(header_table)
-    story.append(Spacer(1, 0.4*inch))
-    
-    # ---------- MAIN TABLE ----------
-    
-    header = [
-        'EXERCISES',
-        'WEEK 1 TARGET', 'REPS',
-        'WEEK 2 TARGET', 'REPS',
-        'WEEK 3 TARGET', 'REPS',
-        'WEEK 4 TARGET', 'REPS',
-    ]
+    return [header_table, Spacer(1, HEADER_GAP * scale)]
+
+def build_main_table(phase_rows, weeks, scale=1.0):
+    """
+    Return the exercise table for a phase.
+    `phase_rows` is a list of (day_label, [[exercise, week 1 text, ...], ...]).
+    """
+    header = ['EXERCISES']
+    for wk in range(1, weeks + 1):
+        header.extend([f'WEEK {wk} TARGET', 'REPS'])
     
     table_data = [header]
-    
-    # Unique accessories per phase, no repeats across days
-    phase_index = MESOCYCLES.index(mesocycle)
-    phase_accessories = choose_phase_accessories_unique(phase_index, mesocycle)
-    
     day_row_ranges = []
     row_idx = 1
     
-    day_order = [
-        ('Monday', 'MONDAY'),
-        ('Tuesday', 'TUESDAY'),
-        ('Wednesday', 'WEDNESDAY'),
-        ('Thursday', 'THURSDAY'),
-    ]
-    
-    for day_name, day_label in day_order:
+    for day_label, rows in phase_rows:
         # Day bar row
         day_bar = [day_label] + [''] * (len(header) - 1)
         table_data.append(day_bar)
@@ -436,127 +315,39 @@ def build_phase_pdf(athlete, mesocycle):
         row_idx += 1
         start_idx = row_idx
         
-        # Main lift row
-        main_lift = MAIN_LIFTS[day_name]
-        max_key = MAIN_LIFT_MAXES[main_lift]
-        main_max = athlete['maxes'].get(max_key)
-        
-        main_row = [main_lift]
-        for wk in range(1, weeks + 1):
-            intensity = get_phase_intensity(mesocycle, wk)
-            if main_max:
-                tw = calculate_target_weight(main_max, intensity)
-                txt = build_bold_target(
-                    f"{mesocycle['main_sets']}×{mesocycle['main_reps']} @",
-                    f"{int(tw)} lbs"
-                )
-            else:
-                txt = f"{mesocycle['main_sets']}×{mesocycle['main_reps']} @ ______"
-            main_row.extend([txt, ""])
-        
-        table_data.append(main_row)
-        row_idx += 1
-        
-        # Accessory rows with phase-aware intensity, reps, and progression
-        accessory_reps = get_accessory_reps(mesocycle)
-        
-        # First, add guaranteed accessories if they exist for this day
-        guaranteed_accs = GUARANTEED_ACCESSORIES.get(day_name, [])
-        for acc in guaranteed_accs:
-            name = acc['name']
-            acc_row = [name]
-            for wk in range(1, weeks + 1):
-                if acc['ref_max'] and acc['factor']:
-                    ref_max = athlete['maxes'].get(acc['ref_max'])
-                    if ref_max:
-                        # For Push Press: apply phase intensity to the training weight
-                        if acc.get('is_push_press'):
-                            # Push Press: 115% of strict press training weight with progression
-                            strict_press_intensity = get_phase_intensity(mesocycle, wk)
-                            strict_press_training = calculate_target_weight(ref_max, strict_press_intensity, round_to=5)
-                            # Push press is 115% of that training weight
-                            tw = calculate_target_weight(strict_press_training, 1.15, round_to=5)
-                        else:
-                            # Standard accessory calculation
-                            acc_intensity = ACCESSORY_INTENSITY[phase_index]
-                            adjusted_factor = acc['factor'] * acc_intensity
-                            phase_progression = get_phase_intensity(mesocycle, wk)
-                            final_factor = adjusted_factor * (phase_progression / ACCESSORY_INTENSITY[phase_index])
-                            tw = calculate_target_weight(ref_max, final_factor, round_to=5)
-                        txt = build_bold_target(f"{mesocycle['main_sets']}×{accessory_reps} @", f"{int(tw)} lbs")
-                    else:
-                        txt = f"{mesocycle['main_sets']}×{accessory_reps} @ ______"
-                else:
-                    txt = f"{mesocycle['main_sets']}×{accessory_reps} @ ______"
-                acc_row.extend([txt, ""])
-            table_data.append(acc_row)
-            row_idx += 1
-        
-        # Then add random accessories for this day
-        for acc in phase_accessories[day_name]:
-            name = acc['name']
-            acc_row = [name]
-            for wk in range(1, weeks + 1):
-                if name in BODYWEIGHT_EXERCISES:
-                    # Bodyweight exercises don't scale with weight progression
-                    txt = "3 sets @ BW"
-                elif acc['ref_max'] and acc['factor']:
-                    ref_max = athlete['maxes'].get(acc['ref_max'])
-                    if ref_max:
-                        # Standard accessory: apply phase intensity multiplier and within-phase progression
-                        acc_intensity = ACCESSORY_INTENSITY[phase_index]
-                        adjusted_factor = acc['factor'] * acc_intensity
-                        # Apply within-phase intensity progression like main lifts
-                        phase_progression = get_phase_intensity(mesocycle, wk)
-                        final_factor = adjusted_factor * (phase_progression / ACCESSORY_INTENSITY[phase_index])
-                        tw = calculate_target_weight(ref_max, final_factor, round_to=5)
-                        txt = build_bold_target(f"{mesocycle['main_sets']}×{accessory_reps} @", f"{int(tw)} lbs")
-                    else:
-                        txt = f"{mesocycle['main_sets']}×{accessory_reps} @ ______"
-                else:
-                    # No ref_max or factor - bodyweight or unweighted
-                    txt = f"{mesocycle['main_sets']} sets @ ______"
-                acc_row.extend([txt, ""])
-            table_data.append(acc_row)
+        # Main lift, guaranteed accessories, then random accessories
+        for name, *week_targets in rows:
+            table_row = [name]
+            for txt in week_targets:
+                table_row.extend([txt, ""])
+            table_data.append(table_row)
             row_idx += 1
         
         end_idx = row_idx - 1
         day_row_ranges.append((bar_idx, start_idx, end_idx))
     
-    normal_style = ParagraphStyle(
-        'Cell',
-        parent=styles['Normal'],
-        fontSize=8,
-        leading=9,
-        alignment=1,
-    )
-    
+    cell_style = get_styles(scale)['cell']
     for r in range(1, len(table_data)):
         row = table_data[r]
         for c in range(1, len(row), 2): # target columns only
             val = row[c]
             if isinstance(val, str) and '@' in val:
-                row[c] = Paragraph(val, normal_style)
+                row[c] = Paragraph(val, cell_style)
     
     # Column widths
-    col_widths = [
-        1.8*inch,
-        1.3*inch, 0.8*inch,
-        1.3*inch, 0.8*inch,
-        1.3*inch, 0.8*inch,
-        1.3*inch, 0.8*inch,
-    ]
+    col_widths = [EXERCISE_COL_WIDTH * scale] + [TARGET_COL_WIDTH * scale, REPS_COL_WIDTH * scale] * weeks
     
     # Row heights
-    row_heights = [0.30*inch] # header
+    row_height = ROW_HEIGHT * scale
+    row_heights = [row_height] # header
     for bar_idx, start_idx, end_idx in day_row_ranges:
         while len(row_heights) < bar_idx:
-            row_heights.append(0.30*inch)
-        row_heights.append(0.25*inch) # day bar
+            row_heights.append(row_height)
+        row_heights.append(DAY_BAR_HEIGHT * scale) # day bar
         for _ in range(start_idx, end_idx + 1):
-            row_heights.append(0.30*inch)
+            row_heights.append(row_height)
     while len(row_heights) < len(table_data):
-        row_heights.append(0.30*inch)
+        row_heights.append(row_height)
     
     main_table = Table(table_data, colWidths=col_widths, rowHeights=row_heights)
     
@@ -566,15 +357,17 @@ def build_phase_pdf(athlete, mesocycle):
         ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
         # Main header row: dark gold
         ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, 0), 9),
+        ('FONTSIZE', (0, 0), (-1, 0), 9*scale),
         ('BACKGROUND', (0, 0), (-1, 0), COLOR_DARK_GOLD),
         ('TEXTCOLOR', (0, 0), (-1, 0), COLOR_BLACK),
         # Body font
-        ('FONTSIZE', (0, 1), (-1, -1), 8),
-        ('BOTTOMPADDING', (0, 0), (-1, 0), 3),
-        ('TOPPADDING', (0, 0), (-1, 0), 3),
-        ('BOTTOMPADDING', (0, 1), (-1, -1), 2),
-        ('TOPPADDING', (0, 1), (-1, -1), 2),
+        ('FONTSIZE', (0, 1), (-1, -1), 8*scale),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 3*scale),
+        ('TOPPADDING', (0, 0), (-1, 0), 3*scale),
+        ('BOTTOMPADDING', (0, 1), (-1, -1), 2*scale),
+        ('TOPPADDING', (0, 1), (-1, -1), 2*scale),
+        ('LEFTPADDING', (0, 0), (-1, -1), 6*scale),
+        ('RIGHTPADDING', (0, 0), (-1, -1), 6*scale),
         # Bold exercise names
         ('FONTNAME', (0, 1), (0, -1), 'Helvetica-Bold'),
     ]
@@ -583,7 +376,7 @@ def build_phase_pdf(athlete, mesocycle):
         base_style.extend([
             ('BACKGROUND', (0, bar_idx), (-1, bar_idx), COLOR_BLACK),
             ('FONTNAME', (0, bar_idx), (-1, bar_idx), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, bar_idx), (-1, bar_idx), 9),
+            ('FONTSIZE', (0, bar_idx), (-1, bar_idx), 9*scale),
             ('TEXTCOLOR', (0, bar_idx), (-1, bar_idx), colors.white),
         ])
         
@@ -596,279 +389,681 @@ def build_phase_pdf(athlete, mesocycle):
             toggle = not toggle
     
     main_table.setStyle(TableStyle(base_style))
-    story.append(main_table)
-    
-    doc.build(story)
-    print(f" → {pdf_filename}")
+    return main_table
 
+def fit_scale(profile, phase_rows, weeks):
+    """Largest scale, at most 1, at which the sheet fits on the profile's page."""
+    page_width, page_height = profile['pagesize']
+    inset = 2 * (profile['margin'] + FRAME_PADDING)
+    content_width = max(
+        sum(HEADER_COL_WIDTHS),
+        EXERCISE_COL_WIDTH + (TARGET_COL_WIDTH + REPS_COL_WIDTH) * weeks,
+    )
+    content_height = HEADER_HEIGHT + HEADER_GAP + ROW_HEIGHT + sum(
+        DAY_BAR_HEIGHT + ROW_HEIGHT * len(rows) for _, rows in phase_rows
+    )
+    return min(1.0, (page_width - inset) / content_width, (page_height - inset) / content_height)
 
-def build_blank_phase_pdf(mesocycle):
-    """
-    Build a blank workout sheet with exercise names but no calculated weights.
-    Athletes can fill in their own weights.
-    """
-    phase_name = mesocycle['name']
-    phase_start = mesocycle['start_date']
-    weeks = mesocycle['weeks']
-    phase_end = phase_start + timedelta(days=weeks * 7 - 1)
-    
-    blank_dir = os.path.join(OUTPUT_DIR, 'BLANK_SHEETS')
-    os.makedirs(blank_dir, exist_ok=True)
-    
-    pdf_filename = os.path.join(
-        blank_dir,
-        f"BLANK_{phase_name.replace(' ', '')}.pdf"
+def sheet_cache_key(title, info_text, phase_rows, weeks, logo_file, profile='letter',
+                    deterministic=True):
+    """Hash of everything that determines a sheet's rendered bytes."""
+    payload = json.dumps(
+        [RENDER_TEMPLATE_VERSION, reportlab.Version, LOGO_PRINT_DPI, deterministic,
+         profile, PAGE_PROFILES[profile]['pagesize'], PAGE_PROFILES[profile]['margin'],
+         title, info_text, weeks, phase_rows],
+        ensure_ascii=False,
     )
+    digest = hashlib.sha256(payload.encode('utf-8'))
+    logo_png = load_logo(logo_file)
+    if logo_png:
+        digest.update(hashlib.sha256(logo_png).digest())
+    return digest.hexdigest()
+
+def render_sheet(title, info_text, phase_rows, weeks, logo_file, cache=None, profile='letter',
+                 deterministic=None):
+    """
+    Render one sheet on the page format named by `profile` (see PAGE_PROFILES)
+    and return the PDF as bytes. With a RenderCache, a sheet whose resolved
+    content was rendered before is returned from the cache.
     
+    In deterministic mode (DETERMINISTIC_PDF unless `deterministic` says
+    otherwise) the PDF carries ReportLab's fixed invariant timestamp and a
+    document ID derived from the sheet's content hash instead of the clock.
+    """
+    if deterministic is None:
+        deterministic = DETERMINISTIC_PDF
+    key = None
+    if cache is not None or deterministic:
+        key = sheet_cache_key(title, info_text, phase_rows, weeks, logo_file, profile, deterministic)
+    if cache is not None:
+        pdf_bytes = cache.get(key)
+        if pdf_bytes is not None:
+            return pdf_bytes
+    
+    started = time.perf_counter()
+    buf = io.BytesIO()
+    page = PAGE_PROFILES[profile]
+    scale = fit_scale(page, phase_rows, weeks)
     doc = SimpleDocTemplate(
-        pdf_filename,
-        pagesize=landscape(letter),
-        topMargin=0.25 * inch,
-        bottomMargin=0.25 * inch,
-        leftMargin=0.25 * inch,
-        rightMargin=0.25 * inch,
+        buf,
+        pagesize=page['pagesize'],
+        topMargin=page['margin'],
+        bottomMargin=page['margin'],
+        leftMargin=page['margin'],
+        rightMargin=page['margin'],
+        title=title,
+        subject=info_text,
+        creator=PDF_CREATOR,
+        invariant=1 if deterministic else 0,
     )
-    
-    story = []
-    styles = getSampleStyleSheet()
-    
-    # ---------- HEADER ----------
-    
-    if os.path.exists(LOGO_FILE):
-        left_logo = Image(LOGO_FILE, width=1.0*inch, height=1.0*inch)
-        right_logo = Image(LOGO_FILE, width=1.0*inch, height=1.0*inch)
+    story = build_header(title, info_text, logo_file, scale)
+    story.append(build_main_table(phase_rows, weeks, scale))
+    if deterministic:
+        # The invariant ID is the same for every document; seed it with the content hash
+        seed_id = lambda canvas, doc: canvas._doc.updateSignature(key)
+        doc.build(story, onFirstPage=seed_id)
     else:
-        left_logo = Paragraph(" ", styles['Normal'])
-        right_logo = Paragraph(" ", styles['Normal'])
-    
-    title_style = ParagraphStyle(
-        'TitleLarge',
-        parent=styles['Heading1'],
-        fontSize=20,
-        leading=22,
-        alignment=1,
-        fontName='Helvetica-Bold',
-        spaceAfter=4,
-    )
+        doc.build(story)
+    pdf_bytes = buf.getvalue()
     
-    date_range_str = f"{phase_start.strftime('%b %d')} – {phase_end.strftime('%b %d, %Y')}"
-    info_text = f"ATHLETE NAME: ________________ | {phase_name} | {date_range_str}"
+    if cache is not None:
+        cache.put(key, pdf_bytes, time.perf_counter() - started)
+    return pdf_bytes
+
+def write_pdf_file(path, data):
+    """Write rendered PDF bytes to `path`; its directory must already exist."""
+    with open(path, 'wb') as f:
+        f.write(data)
+
+def save_sheet(path, data, writer=None):
+    """Hand a rendered sheet to `writer`, or write it synchronously if None."""
+    if writer is not None:
+        writer.submit(path, data)
+    else:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        write_pdf_file(path, data)
+
+def sheet_filename(directory, stem, profile):
+    suffix = PAGE_PROFILES[profile]['suffix']
+    return os.path.join(directory, f"{stem}_{suffix}.pdf" if suffix else f"{stem}.pdf")
+
+def render_and_save(pdf_stem, title, info_text, phase_rows, weeks, logo_file,
+                    writer, cache, profiles):
+    """Render already-computed sheet content into each page profile and save it."""
+    paths = []
+    for profile in profiles:
+        path = sheet_filename(os.path.dirname(pdf_stem), os.path.basename(pdf_stem), profile)
+        pdf_bytes = render_sheet(title, info_text, phase_rows, weeks, logo_file, cache, profile)
+        save_sheet(path, pdf_bytes, writer)
+        paths.append(path)
+    return paths
+
+def format_date_range(mesocycle):
+    phase_start = mesocycle['start_date']
+    phase_end = phase_start + timedelta(days=mesocycle['weeks'] * 7 - 1)
+    return f"{phase_start.strftime('%b %d')} – {phase_end.strftime('%b %d, %Y')}"
+
+def build_phase_pdf(athlete, mesocycle, program, output_dir=None, logo_file=None, title=None,
+                    writer=None, cache=None, profiles=DEFAULT_PROFILES):
+    """
+    Build one athlete's sheet for a phase in each page format in `profiles`
+    and save them (through `writer` if given, see SheetWriter; reusing
+    `cache`, a RenderCache, if given). Targets are computed once for all
+    formats. Returns the PDF paths.
+    """
+    phase_name = mesocycle['name']
     
-    info_style = ParagraphStyle(
-        'Info',
-        parent=styles['Normal'],
-        fontSize=12,
-        leading=14,
-        alignment=1,
-        fontName='Helvetica-Bold',
-    )
+    athlete_name = safe_name(athlete['name'])
+    athlete_dir = os.path.join(output_dir or OUTPUT_DIR, athlete_name)
     
-    center_cell = [
-        Paragraph("PHS FOOTBALL POWER PROGRAM", title_style),
-        Paragraph(info_text, info_style),
-    ]
+    pdf_stem = os.path.join(athlete_dir, f"{athlete_name}_{phase_name.replace(' ', '')}")
     
-    header_row = [[left_logo, center_cell, right_logo]]
-    header_table = Table(
-        header_row,
-        colWidths=[2.0*inch, 5.7*inch, 2.0*inch],
-        rowHeights=[1.10*inch],
-    )
+    info_text = f"{athlete['name']} | {phase_name} | {format_date_range(mesocycle)}"
     
-    header_table.setStyle(TableStyle([
-        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-        ('ALIGN', (0, 0), (0, 0), 'CENTER'),
-        ('ALIGN', (1, 0), (1, 0), 'CENTER'),
-        ('ALIGN', (2, 0), (2, 0), 'CENTER'),
-        ('BOX', (0, 0), (-1, -1), 0, colors.white),
-    ]))
-    
-    story.append(header_table)
-    story.append(Spacer(1, 0.4*inch))
-    
-    # ---------- MAIN TABLE ----------
-    
-    header = [
-        'EXERCISES',
-        'WEEK 1 TARGET', 'REPS',
-        'WEEK 2 TARGET', 'REPS',
-        'WEEK 3 TARGET', 'REPS',
-        'WEEK 4 TARGET', 'REPS',
+    # Unique accessories per phase, no repeats across days
+    phase_rows = [
+        (day_label, [[row['name']] + week_targets for row, week_targets in rows])
+        for _, day_label, rows in compute_phase_targets(athlete['maxes'], mesocycle, program)
     ]
     
-    table_data = [header]
+    return render_and_save(pdf_stem, title or program['title'], info_text, phase_rows,
+                           mesocycle['weeks'], logo_file or LOGO_FILE, writer, cache, profiles)
+
+
+def build_blank_phase_pdf(mesocycle, program, output_dir=None, logo_file=None, title=None,
+                          writer=None, cache=None, profiles=DEFAULT_PROFILES):
+    """
+    Build a blank workout sheet with exercise names but no calculated weights.
+    Athletes can fill in their own weights. Returns the PDF paths, one per
+    page format in `profiles`.
+    """
+    phase_name = mesocycle['name']
+    weeks = mesocycle['weeks']
     
-    # Get the same exercise structure as athlete sheets (use phase index 0 for blank structure)
-    phase_index = MESOCYCLES.index(mesocycle)
-    phase_accessories = choose_phase_accessories_unique(phase_index, mesocycle)
+    blank_dir = os.path.join(output_dir or OUTPUT_DIR, 'BLANK_SHEETS')
     
-    day_row_ranges = []
-    row_idx = 1
+    pdf_stem = os.path.join(blank_dir, f"BLANK_{phase_name.replace(' ', '')}")
     
-    day_order = [
-        ('Monday', 'MONDAY'),
-        ('Tuesday', 'TUESDAY'),
-        ('Wednesday', 'WEDNESDAY'),
-        ('Thursday', 'THURSDAY'),
-    ]
+    info_text = f"ATHLETE NAME: ________________ | {phase_name} | {format_date_range(mesocycle)}"
     
-    for day_name, day_label in day_order:
-        # Day bar row
-        day_bar = [day_label] + [''] * (len(header) - 1)
-        table_data.append(day_bar)
-        bar_idx = row_idx
-        row_idx += 1
-        start_idx = row_idx
-        
-        # Main lift row
-        main_lift = MAIN_LIFTS[day_name]
-        main_row = [main_lift]
-        for wk in range(1, weeks + 1):
-            txt = f"{mesocycle['main_sets']}×{mesocycle['main_reps']} @ ______"
-            main_row.extend([txt, ""])
-        
-        table_data.append(main_row)
-        row_idx += 1
-        
-        # Accessory rows
-        accessory_reps = get_accessory_reps(mesocycle)
-        
-        # First, add guaranteed accessories if they exist for this day
-        guaranteed_accs = GUARANTEED_ACCESSORIES.get(day_name, [])
-        for acc in guaranteed_accs:
-            name = acc['name']
-            acc_row = [name]
-            for wk in range(1, weeks + 1):
+    # Same exercise structure as athlete sheets, with every weight left blank
+    accessory_reps = get_accessory_reps(mesocycle)
+    phase_rows = []
+    for _, day_label, rows in program['layouts'][mesocycle['index']]:
+        day_rows = []
+        for row in rows:
+            if row['kind'] == 'main':
+                txt = f"{mesocycle['main_sets']}×{mesocycle['main_reps']} @ ______"
+            elif row['is_bodyweight']:
+                txt = "3 sets @ BW"
+            else:
                 txt = f"{mesocycle['main_sets']}×{accessory_reps} @ ______"
-                acc_row.extend([txt, ""])
-            table_data.append(acc_row)
-            row_idx += 1
-        
-        # Then add random accessories for this day
-        for acc in phase_accessories[day_name]:
-            name = acc['name']
-            acc_row = [name]
-            for wk in range(1, weeks + 1):
-                if name in BODYWEIGHT_EXERCISES:
-                    txt = "3 sets @ BW"
-                else:
-                    txt = f"{mesocycle['main_sets']}×{accessory_reps} @ ______"
-                acc_row.extend([txt, ""])
-            table_data.append(acc_row)
-            row_idx += 1
-        
-        end_idx = row_idx - 1
-        day_row_ranges.append((bar_idx, start_idx, end_idx))
-    
-    normal_style = ParagraphStyle(
-        'Cell',
-        parent=styles['Normal'],
-        fontSize=8,
-        leading=9,
-        alignment=1,
-    )
-    
-    for r in range(1, len(table_data)):
-        row = table_data[r]
-        for c in range(1, len(row), 2): # target columns only
-            val = row[c]
-            if isinstance(val, str):
-                row[c] = Paragraph(val, normal_style)
-    
-    # Column widths
-    col_widths = [
-        1.8*inch,
-        1.3*inch, 0.8*inch,
-        1.3*inch, 0.8*inch,
-        1.3*inch, 0.8*inch,
-        1.3*inch, 0.8*inch,
-    ]
-    
-    # Row heights
-    row_heights = [0.30*inch] # header
-    for bar_idx, start_idx, end_idx in day_row_ranges:
-        while len(row_heights) < bar_idx:
-            row_heights.append(0.30*inch)
-        row_heights.append(0.25*inch) # day bar
-        for _ in range(start_idx, end_idx + 1):
-            row_heights.append(0.30*inch)
-    while len(row_heights) < len(table_data):
-        row_heights.append(0.30*inch)
-    
-    main_table = Table(table_data, colWidths=col_widths, rowHeights=row_heights)
+            day_rows.append([row['name']] + [txt] * weeks)
+        phase_rows.append((day_label, day_rows))
     
-    base_style = [
-        ('GRID', (0, 0), (-1, -1), 0.5, COLOR_BLACK),
-        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-        # Main header row: dark gold
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, 0), 9),
-        ('BACKGROUND', (0, 0), (-1, 0), COLOR_DARK_GOLD),
-        ('TEXTCOLOR', (0, 0), (-1, 0), COLOR_BLACK),
-        # Body font
-        ('FONTSIZE', (0, 1), (-1, -1), 8),
-        ('BOTTOMPADDING', (0, 0), (-1, 0), 3),
-        ('TOPPADDING', (0, 0), (-1, 0), 3),
-        ('BOTTOMPADDING', (0, 1), (-1, -1), 2),
-        ('TOPPADDING', (0, 1), (-1, -1), 2),
-        # Bold exercise names
-        ('FONTNAME', (0, 1), (0, -1), 'Helvetica-Bold'),
-    ]
+    return render_and_save(pdf_stem, title or program['title'], info_text, phase_rows,
+                           weeks, logo_file or LOGO_FILE, writer, cache, profiles)
+
+# =========================
+# RENDER CACHE
+# =========================
+
+class RenderCache:
+    """
+    Content-addressed store of rendered sheets on disk, keyed by
+    sheet_cache_key(). Identical sheets (blank sheets, athletes whose maxes
+    did not change since the last run) are rendered once and reused across
+    athletes, teams and runs. Once the cache grows past `max_bytes` the least
+    recently used entries are evicted.
+    """
     
-    for bar_idx, start_idx, end_idx in day_row_ranges:
-        base_style.extend([
-            ('BACKGROUND', (0, bar_idx), (-1, bar_idx), COLOR_BLACK),
-            ('FONTNAME', (0, bar_idx), (-1, bar_idx), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, bar_idx), (-1, bar_idx), 9),
-            ('TEXTCOLOR', (0, bar_idx), (-1, bar_idx), colors.white),
-        ])
-        
-        toggle = True
-        for r in range(start_idx, end_idx + 1):
-            bg = ROW_BG_LIGHT if toggle else ROW_BG_MED
-            base_style.append(
-                ('BACKGROUND', (0, r), (-1, r), bg)
-            )
-            toggle = not toggle
+    # Each entry stores the seconds its render took ahead of the PDF bytes
+    HEADER = struct.Struct('<d')
+    
+    def __init__(self, cache_dir=RENDER_CACHE_DIR, max_bytes=RENDER_CACHE_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self._total_bytes = None # scanned on first put
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.seconds_saved = 0.0
+        self.render_seconds = 0.0
+    
+    def _path(self, key):
+        return os.path.join(self.cache_dir, key[:2], f"{key}.pdfc")
+    
+    def get(self, key):
+        """Return cached PDF bytes for `key`, or None on a miss."""
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                blob = f.read()
+        except OSError:
+            blob = b''
+        if len(blob) <= self.HEADER.size:
+            self.misses += 1
+            return None
+        try:
+            os.utime(path) # mark as recently used
+        except OSError:
+            pass
+        self.hits += 1
+        self.seconds_saved += self.HEADER.unpack_from(blob)[0]
+        return blob[self.HEADER.size:]
+    
+    def put(self, key, data, render_seconds):
+        """Store a freshly rendered sheet; caching is best-effort."""
+        self.render_seconds += render_seconds
+        path = self._path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(self.HEADER.pack(render_seconds))
+                f.write(data)
+            os.replace(tmp_path, path)
+        except OSError:
+            return
+        if self._total_bytes is None:
+            self._total_bytes = sum(size for _, size, _ in self._scan())
+        else:
+            self._total_bytes += self.HEADER.size + len(data)
+        if self._total_bytes > self.max_bytes:
+            self._evict()
+    
+    def _scan(self):
+        entries = []
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                if not name.endswith('.pdfc'):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue # evicted by another process
+                entries.append((st.st_mtime, st.st_size, path))
+        return entries
+    
+    def _evict(self):
+        # Trim to 90% so a full cache doesn't rescan on every put
+        entries = sorted(self._scan())
+        total = sum(size for _, size, _ in entries)
+        target = self.max_bytes * 0.9
+        for _, size, path in entries:
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            self.evictions += 1
+        self._total_bytes = total
+    
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0,
+            'evictions': self.evictions,
+            'seconds_saved': round(self.seconds_saved, 3),
+            'render_seconds': round(self.render_seconds, 3),
+        }
+
+# =========================
+# BACKGROUND WRITING
+# =========================
+
+class SheetWriter:
+    """
+    Writes rendered sheets to disk on a small pool of background threads, so
+    rendering is not stalled by slow (e.g. network-mounted) output storage.
+    Each directory is created once. At most `max_pending` sheets are held in
+    memory; submit() blocks until a slot frees up. Use as a context manager:
+    leaving the block waits for every write and re-raises the first failure,
+    unless the block itself is already raising.
+    """
     
-    main_table.setStyle(TableStyle(base_style))
-    story.append(main_table)
+    def __init__(self, workers=2, max_pending=16):
+        self._executor = ThreadPoolExecutor(max_workers=workers)
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._lock = threading.Lock()
+        self._made_dirs = set()
+        self._errors = []
+        self.files_written = 0
+        self.bytes_written = 0
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            # Let the original error through rather than a queued write error
+            self._executor.shutdown(wait=True)
+    
+    def submit(self, path, data):
+        """Queue `data` to be written to `path`, blocking while the buffer is full."""
+        self._slots.acquire()
+        try:
+            self._executor.submit(self._write, path, data)
+        except BaseException:
+            self._slots.release()
+            raise
+    
+    def _ensure_dir(self, directory):
+        with self._lock:
+            if directory in self._made_dirs:
+                return
+        # Outside the lock, so one slow mkdir does not hold up writes to other
+        # directories; exist_ok makes a racing duplicate harmless
+        os.makedirs(directory, exist_ok=True)
+        with self._lock:
+            self._made_dirs.add(directory)
+    
+    def _write(self, path, data):
+        try:
+            self._ensure_dir(os.path.dirname(path))
+            write_pdf_file(path, data)
+            with self._lock:
+                self.files_written += 1
+                self.bytes_written += len(data)
+        except Exception as e:
+            with self._lock:
+                self._errors.append(e)
+        finally:
+            self._slots.release()
+    
+    def close(self):
+        """Wait for all queued writes; raise the first error if any failed."""
+        self._executor.shutdown(wait=True)
+        if self._errors:
+            raise self._errors[0]
+
+# =========================
+# TEAM & BATCH RUNS
+# =========================
+
+class ManifestError(ValueError):
+    """Raised when a batch manifest is missing or malformed."""
+
+def generate_team(athletes, program, output_dir=None, logo_file=None, title=None, verbose=True,
+                  cache=None, profiles=DEFAULT_PROFILES):
+    """
+    Render every athlete's sheets plus the blank sheets in each page format
+    in `profiles`, overlapping rendering with disk writes through a
+    SheetWriter and reusing unchanged sheets from `cache` (a RenderCache) if
+    given. Returns the PDF paths.
+    """
+    with SheetWriter() as writer:
+        return _generate_team(athletes, program, output_dir, logo_file, title, verbose, writer, cache,
+                              profiles)
+
+def _generate_team(athletes, program, output_dir, logo_file, title, verbose, writer, cache, profiles):
+    paths = []
+    for athlete in athletes:
+        if verbose:
+            print(f"Generating workouts for {athlete['name']}...")
+            print(f" Maxes: BackSq={athlete['maxes']['Back Squat']}, "
+                  f"BP={athlete['maxes']['Bench Press']}, "
+                  f"DL={athlete['maxes']['Deadlift']}, "
+                  f"OHP={athlete['maxes']['Shoulder Press']}")
+        for meso in program['mesocycles']:
+            sheet_paths = build_phase_pdf(athlete, meso, program, output_dir, logo_file, title,
+                                          writer, cache, profiles)
+            paths.extend(sheet_paths)
+            if verbose:
+                for path in sheet_paths:
+                    print(f" → {path}")
+        if verbose:
+            print()
     
-    doc.build(story)
-    print(f" → {pdf_filename}")
+    # Generate blank sheets for each phase
+    if verbose:
+        print("Generating blank sheets for new athletes...\n")
+    for meso in program['mesocycles']:
+        if verbose:
+            print(f"Generating blank {meso['name']} sheet...")
+        sheet_paths = build_blank_phase_pdf(meso, program, output_dir, logo_file, title,
+                                            writer, cache, profiles)
+        paths.extend(sheet_paths)
+        if verbose:
+            for path in sheet_paths:
+                print(f" → {path}")
+    return paths
+
+def load_manifest(path):
+    """
+    Read a batch manifest: {"defaults": {...}, "teams": [{...}, ...]}.
+    Each team needs a 'roster' CSV and may set 'name', 'program', 'output_dir',
+    'logo', 'title', 'formats' (a page profile name or a list of them, see
+    PAGE_PROFILES) and
+    'render_cache' (false to always re-render); anything
+    missing comes from 'defaults'. Relative paths
+    are resolved against the manifest's directory.
+    Returns the list of resolved team entries.
+    """
+    try:
+        with open(path, encoding='utf-8') as f:
+            manifest = json.load(f)
+    except OSError as e:
+        raise ManifestError(f"{path}: cannot read manifest ({e.strerror})")
+    except ValueError as e:
+        raise ManifestError(f"{path}: invalid JSON ({e})")
+    
+    if not isinstance(manifest, dict):
+        raise ManifestError(f"{path}: manifest must be a JSON object")
+    base_dir = os.path.dirname(os.path.abspath(path))
+    defaults = manifest.get('defaults', {})
+    if not isinstance(defaults, dict):
+        raise ManifestError(f"{path}: 'defaults' must be an object")
+    teams = manifest.get('teams')
+    if not teams:
+        raise ManifestError(f"{path}: manifest lists no teams")
+    if not isinstance(teams, list):
+        raise ManifestError(f"{path}: 'teams' must be a list of objects")
+    
+    entries = []
+    for i, team in enumerate(teams):
+        if not isinstance(team, dict):
+            raise ManifestError(f"{path}: teams[{i}] must be an object")
+        entry = dict(defaults)
+        entry.update(team)
+        if 'roster' not in entry:
+            raise ManifestError(f"{path}: teams[{i}] has no 'roster'")
+        for key in ('name', 'roster', 'program', 'output_dir', 'logo', 'title'):
+            if entry.get(key) is not None and not isinstance(entry[key], str):
+                raise ManifestError(f"{path}: teams[{i}] '{key}' must be a string")
+        entry.setdefault('name', os.path.splitext(os.path.basename(entry['roster']))[0])
+        entry.setdefault('output_dir', os.path.join(OUTPUT_DIR, entry['name'].replace(' ', '_')))
+        for key in ('roster', 'program', 'output_dir', 'logo'):
+            if entry.get(key):
+                entry[key] = os.path.join(base_dir, entry[key])
+        formats = entry.get('formats', list(DEFAULT_PROFILES))
+        if not isinstance(formats, (str, list)) or not all(isinstance(f, str) for f in formats):
+            raise ManifestError(f"{path}: teams[{i}] 'formats' must be a format name or a "
+                                f"list of them ({', '.join(PAGE_PROFILES)})")
+        try:
+            entry['formats'] = normalize_formats(formats)
+        except ValueError as e:
+            raise ManifestError(f"{path}: teams[{i}] 'formats': {e}")
+        entries.append(entry)
+    return entries
+
+def _warm_caches(entries):
+    """Load every program and logo a batch needs, so no team pays for them."""
+    get_styles()
+    # Runs as the Pool initializer, so it must never raise: a failing program
+    # or logo is loaded again, and reported, by run_batch_entry()
+    for entry in entries:
+        try:
+            load_program(entry.get('program'))
+        except Exception:
+            pass
+        try:
+            load_logo(entry.get('logo') or LOGO_FILE)
+        except Exception:
+            pass
+
+def run_batch_entry(entry):
+    """Generate one team from a manifest entry. Returns its report record."""
+    started = time.perf_counter()
+    result = {
+        'name': entry['name'],
+        'roster': entry['roster'],
+        'program': entry.get('program'),
+        'output_dir': entry['output_dir'],
+        'status': 'ok',
+        'athletes': 0,
+        'sheets': 0,
+    }
+    cache = RenderCache() if entry.get('render_cache', True) else None
+    try:
+        program = load_program(entry.get('program'))
+        athletes = load_athletes(entry['roster'])
+        if not athletes:
+            raise ValueError(f"no athletes found in {entry['roster']}")
+        paths = generate_team(athletes, program, entry['output_dir'],
+                              entry.get('logo'), entry.get('title'), verbose=False, cache=cache,
+                              profiles=entry['formats'])
+        result['athletes'] = len(athletes)
+        result['sheets'] = len(paths)
+    except Exception as e: # one bad team must not sink the whole batch
+        result['status'] = 'error'
+        result['error'] = f"{type(e).__name__}: {e}"
+    result['seconds'] = round(time.perf_counter() - started, 3)
+    if cache is not None:
+        result['render_cache'] = cache.stats()
+    return result
+
+def normalize_formats(names):
+    """
+    Page profile names from a comma-separated string or a list of names,
+    case-insensitive and without repeats. Raises ValueError if any is unknown
+    or none are given.
+    """
+    if isinstance(names, str):
+        names = names.split(',')
+    formats = []
+    for name in names:
+        name = name.strip().lower()
+        if name and name not in formats:
+            formats.append(name)
+    unknown = [f for f in formats if f not in PAGE_PROFILES]
+    if unknown:
+        raise ValueError(f"unknown format(s) {', '.join(unknown)}; choose from {', '.join(PAGE_PROFILES)}")
+    if not formats:
+        raise ValueError(f"no format given; choose from {', '.join(PAGE_PROFILES)}")
+    return formats
+
+def parse_formats(text):
+    """Split a comma-separated --formats value into page profile names."""
+    try:
+        return normalize_formats(text)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+
+def run_batch(manifest_path, workers=1, report_path=None, render_cache=True, formats=None):
+    """
+    Generate every team in a manifest in this process (or a pool of `workers`
+    processes), sharing compiled programs, styles, logos and the render cache
+    across teams. `formats` overrides every team's page formats. Writes a JSON
+    run report and returns it.
+    """
+    entries = load_manifest(manifest_path)
+    for entry in entries:
+        if not render_cache:
+            entry['render_cache'] = False
+        if formats:
+            entry['formats'] = list(formats)
+    started_at = datetime.now().isoformat(timespec='seconds')
+    started = time.perf_counter()
+    
+    if workers > 1:
+        with multiprocessing.Pool(workers, initializer=_warm_caches, initargs=(entries,)) as pool:
+            results = pool.map(run_batch_entry, entries, chunksize=1)
+    else:
+        _warm_caches(entries)
+        results = [run_batch_entry(entry) for entry in entries]
+    
+    wall_seconds = time.perf_counter() - started
+    report = {
+        'manifest': manifest_path,
+        'started_at': started_at,
+        'workers': workers,
+        'teams': results,
+        'totals': {
+            'teams': len(results),
+            'failed': sum(1 for r in results if r['status'] != 'ok'),
+            'athletes': sum(r['athletes'] for r in results),
+            'sheets': sum(r['sheets'] for r in results),
+            'team_seconds': round(sum(r['seconds'] for r in results), 3),
+            'wall_seconds': round(wall_seconds, 3),
+        },
+    }
+    cache_stats = [r['render_cache'] for r in results if 'render_cache' in r]
+    if cache_stats:
+        hits = sum(s['hits'] for s in cache_stats)
+        lookups = hits + sum(s['misses'] for s in cache_stats)
+        report['totals']['render_cache'] = {
+            'hits': hits,
+            'misses': lookups - hits,
+            'hit_rate': round(hits / lookups, 3) if lookups else 0.0,
+            'seconds_saved': round(sum(s['seconds_saved'] for s in cache_stats), 3),
+        }
+    
+    if report_path is None:
+        report_path = os.path.join(OUTPUT_DIR, 'batch_report.json')
+    os.makedirs(os.path.dirname(report_path) or '.', exist_ok=True)
+    with open(report_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    report['report_path'] = report_path
+    return report
 
 # =========================
 # MAIN
 # =========================
 
-def main():
-    print("\n=== PHS FOOTBALL POWER PROGRAM Workout Sheet Generator ===\n")
-    
-    athletes = load_athletes(TESTING_DATA_FILE)
+def print_cache_stats(stats):
+    lookups = stats['hits'] + stats['misses']
+    print(f"\nRender cache: {stats['hits']}/{lookups} sheet(s) reused "
+          f"({stats['hit_rate']:.0%}), ~{stats['seconds_saved']:.2f}s saved")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate printable mesocycle workout sheets.")
+    parser.add_argument('--program', default=None,
+                        help="program definition file (JSON or TOML); defaults to the PHS football program")
+    parser.add_argument('--batch', metavar='MANIFEST',
+                        help="generate every team listed in a JSON batch manifest")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="worker processes for --batch (default: 1, run in this process)")
+    parser.add_argument('--report', default=None,
+                        help="where --batch writes its JSON run report (default: output/batch_report.json)")
+    parser.add_argument('--snapshot', metavar='DATE',
+                        help="use the maxes stored for this test date (YYYY-MM-DD) instead of the CSV")
+    parser.add_argument('--history', default=HISTORY_DIR,
+                        help=f"testing history store for --snapshot (default: {HISTORY_DIR})")
+    parser.add_argument('--no-render-cache', action='store_true',
+                        help=f"always re-render instead of reusing unchanged sheets from {RENDER_CACHE_DIR}/")
+    parser.add_argument('--formats', type=parse_formats, default=None,
+                        help=f"comma-separated page formats to render: {', '.join(PAGE_PROFILES)} "
+                             f"(default: {','.join(DEFAULT_PROFILES)})")
+    args = parser.parse_args(argv)
+    
+    if args.batch:
+        try:
+            report = run_batch(args.batch, args.workers, args.report, not args.no_render_cache,
+                               args.formats)
+        except ManifestError as e:
+            print(f"Error: {e}")
+            return 1
+        for team in report['teams']:
+            if team['status'] == 'ok':
+                print(f"{team['name']}: {team['sheets']} sheet(s) for "
+                      f"{team['athletes']} athlete(s) in {team['seconds']:.2f}s")
+            else:
+                print(f"{team['name']}: FAILED - {team['error']}")
+        totals = report['totals']
+        if 'render_cache' in totals:
+            print_cache_stats(totals['render_cache'])
+        print(f"\n✓ {totals['teams'] - totals['failed']}/{totals['teams']} team(s), "
+              f"{totals['sheets']} sheet(s) in {totals['wall_seconds']:.2f}s "
+              f"(report: {report['report_path']})")
+        return 1 if totals['failed'] else 0
+    
+    try:
+        program = load_program(args.program)
+    except ProgramError as e:
+        print(f"Error: {e}")
+        return 1
+    
+    print(f"\n=== {program['title']} Workout Sheet Generator ===\n")
+    
+    if args.snapshot:
+        try:
+            athletes = load_snapshot(args.snapshot, args.history)
+        except HistoryError as e:
+            print(f"Error: {e}")
+            return 1
+    else:
+        athletes = load_athletes(TESTING_DATA_FILE)
     if not athletes:
         print("No athletes found. Exiting.")
-        return
+        return 1
     
     print(f"Loaded {len(athletes)} athlete(s).\n")
     
-    for athlete in athletes:
-        print(f"Generating workouts for {athlete['name']}...")
-        print(f" Maxes: BackSq={athlete['maxes']['Back Squat']}, "
-              f"BP={athlete['maxes']['Bench Press']}, "
-              f"DL={athlete['maxes']['Deadlift']}, "
-              f"OHP={athlete['maxes']['Shoulder Press']}")
-        for meso in MESOCYCLES:
-            build_phase_pdf(athlete, meso)
-        print()
-    
-    # Generate blank sheets for each phase
-    print("Generating blank sheets for new athletes...\n")
-    for meso in MESOCYCLES:
-        print(f"Generating blank {meso['name']} sheet...")
-        build_blank_phase_pdf(meso)
+    cache = None if args.no_render_cache else RenderCache()
+    generate_team(athletes, program, cache=cache, profiles=args.formats or DEFAULT_PROFILES)
     
+    if cache is not None:
+        print_cache_stats(cache.stats())
     print("\n✓ Complete!")
+    return 0
 
 if __name__ == '__main__':
-    main()
+    sys.exit(main())
@@ -0,0 +1,105 @@
+"""
+Check that sheet rendering still produces byte-identical PDFs.
+
+Renders the example roster with the default program in every page format
+(plus the blank sheets), with the render cache off, and compares each
+file's SHA-256 against golden_hashes.json. Run it before and after changing
+the renderers; any difference in output is reported per sheet.
+
+    python golden_hashes.py            # check, exits 1 on any mismatch
+    python golden_hashes.py --update   # accept the current output as golden
+
+The golden hashes are only valid for the ReportLab and Pillow versions
+recorded in the file; after upgrading either, check the sheets by eye and
+re-run with --update.
+"""
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import PIL
+import reportlab
+
+import generate_workouts as gw
+from program_loader import load_program
+
+GOLDEN_FILE = 'golden_hashes.json'
+ROSTER_FILE = 'athlete_testing_example.csv'
+
+
+def render_hashes():
+    """Render the reference sheets into a scratch directory; return {relative path: sha256}."""
+    program = load_program()
+    athletes = gw.load_athletes(ROSTER_FILE)
+    tmp = tempfile.mkdtemp(prefix='golden_')
+    try:
+        paths = gw.generate_team(athletes, program, tmp, verbose=False,
+                                 profiles=list(gw.PAGE_PROFILES))
+        hashes = {}
+        for path in paths:
+            with open(path, 'rb') as f:
+                key = os.path.relpath(path, tmp).replace(os.sep, '/')
+                hashes[key] = hashlib.sha256(f.read()).hexdigest()
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+    return dict(sorted(hashes.items()))
+
+
+def versions():
+    return {'reportlab': reportlab.Version, 'pillow': PIL.__version__}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--update', action='store_true', help=f"rewrite {GOLDEN_FILE} from the current output")
+    parser.add_argument('--golden', default=GOLDEN_FILE)
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    hashes = render_hashes()
+    elapsed = time.perf_counter() - started
+
+    if args.update:
+        with open(args.golden, 'w', encoding='utf-8') as f:
+            json.dump({'versions': versions(), 'sheets': hashes}, f, indent=2)
+            f.write('\n')
+        print(f"Wrote {len(hashes)} golden hash(es) to {args.golden}")
+        return 0
+
+    try:
+        with open(args.golden, encoding='utf-8') as f:
+            golden = json.load(f)
+    except FileNotFoundError:
+        print(f"Error: {args.golden} not found; run with --update to create it")
+        return 1
+
+    if golden.get('versions') != versions():
+        print(f"Warning: golden hashes were made with {golden.get('versions')}, "
+              f"running {versions()}; differences may come from the libraries")
+
+    expected = golden['sheets']
+    failures = 0
+    for key in sorted(set(expected) | set(hashes)):
+        if key not in hashes:
+            print(f"MISSING  {key}")
+        elif key not in expected:
+            print(f"NEW      {key}")
+        elif hashes[key] != expected[key]:
+            print(f"CHANGED  {key}")
+        else:
+            continue
+        failures += 1
+
+    identical = sum(1 for key, digest in hashes.items() if expected.get(key) == digest)
+    print(f"{identical}/{identical + failures} sheet(s) identical "
+          f"({elapsed:.2f}s)")
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
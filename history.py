@@ -0,0 +1,377 @@
+"""
+Columnar testing-history store and progression queries.
+
+Each ingested testing CSV becomes one partition (one per test date) of
+column files: int32 athlete codes plus one float32 column per lift, with NaN
+for "no max". Every other CSV column (push ups, vertical jump, ...) is kept
+as a "measure": a float32 column of its first number plus the cell text as
+written. Athlete names are dictionary-encoded once for the whole store.
+Queries memory-map one partition at a time, so years of district data never
+have to fit in memory at once.
+
+    python history.py ingest athlete_testing.csv --date 2026-01-05
+    python history.py progression "Student 1"
+    python history.py measures "Student 1"
+    python history.py percentiles "Bench Press" [--date 2026-01-05]
+    python history.py gainers "Bench Press" --since 2025-08-01 --until 2026-01-05
+"""
+import argparse
+import json
+import os
+import re
+import shutil
+import sys
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from roster import MAX_COLUMNS, NAME_COLUMN
+
+# =========================
+# CONFIGURATION
+# =========================
+
+HISTORY_DIR = 'testing_history'
+DEFAULT_PERCENTILES = (10, 25, 50, 75, 90)
+
+# Max key -> column file name inside a partition
+LIFT_FILES = {lift: lift.lower().replace(' ', '_') + '.npy' for lift in MAX_COLUMNS}
+ATHLETE_FILE = 'athlete.npy'
+MEASURES_FILE = 'measures.json' # per partition: CSV column -> column file stem
+
+
+class HistoryError(ValueError):
+    """Raised for an unknown lift, athlete or test date, or a bad store."""
+
+
+# =========================
+# STORE LAYOUT
+# =========================
+
+def _check_date(test_date):
+    try:
+        return datetime.strptime(test_date, '%Y-%m-%d').strftime('%Y-%m-%d')
+    except (TypeError, ValueError):
+        raise HistoryError(f"test date must be YYYY-MM-DD, got {test_date!r}")
+
+def _check_lift(lift):
+    if lift not in LIFT_FILES:
+        raise HistoryError(f"unknown lift or measure '{lift}' (expected one of {', '.join(LIFT_FILES)})")
+    return lift
+
+def _write_json(path, data):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2)
+    os.replace(tmp_path, path)
+
+def _read_json(path, default):
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return default
+
+def _partition_dir(store_dir, test_date):
+    return os.path.join(store_dir, 'partitions', test_date)
+
+def load_athlete_names(store_dir=HISTORY_DIR):
+    """Return the store's athlete dictionary: code -> name."""
+    return _read_json(os.path.join(store_dir, 'athletes.json'), [])
+
+def list_snapshots(store_dir=HISTORY_DIR):
+    """Return the ingested test dates, oldest first."""
+    return sorted(_read_json(os.path.join(store_dir, 'snapshots.json'), {}))
+
+def _as_max(value):
+    """A stored float32 max as the number written in the CSV (None for no max)."""
+    if np.isnan(value):
+        return None
+    # Shortest decimal that round-trips through float32, e.g. 187.3 not 187.300003...
+    return float(np.format_float_positional(np.float32(value)))
+
+def _partition_file(store_dir, test_date, filename):
+    partition = _partition_dir(store_dir, test_date)
+    # Mid-swap (or after a crash there) only the set-aside copy exists
+    for directory in (partition, f"{partition}.old"):
+        path = os.path.join(directory, filename)
+        if os.path.exists(path):
+            return path
+    raise HistoryError(f"no testing snapshot for {test_date} in {store_dir}")
+
+def _column(store_dir, test_date, filename):
+    return np.load(_partition_file(store_dir, test_date, filename), mmap_mode='r')
+
+def _measure_files(store_dir, test_date):
+    """CSV column -> file stem of the non-lift columns stored for `test_date`."""
+    try:
+        return _read_json(_partition_file(store_dir, test_date, MEASURES_FILE), {})
+    except HistoryError:
+        return {} # snapshots ingested before measures were stored
+
+# =========================
+# INGEST
+# =========================
+
+def parse_max_column(series):
+    """Vectorized parse_max(): first number in each cell, NaN if none."""
+    return pd.to_numeric(
+        series.astype(str).str.extract(r'(\d+(?:\.\d+)?)', expand=False),
+        errors='coerce',
+    ).to_numpy(dtype=np.float32)
+
+def _measure_stem(column, taken):
+    stem = 'measure_' + (re.sub(r'[^a-z0-9]+', '_', column.lower()).strip('_') or 'column')
+    candidate, n = stem, 2
+    while candidate in taken:
+        candidate, n = f"{stem}_{n}", n + 1
+    return candidate
+
+def ingest_csv(filename, test_date, store_dir=HISTORY_DIR):
+    """
+    Append a testing CSV to the store as the snapshot for `test_date`,
+    replacing any earlier snapshot for the same date. Lifts and every other
+    non-empty column are stored. Returns the row count.
+    """
+    test_date = _check_date(test_date)
+    try:
+        df = pd.read_csv(filename, dtype=str, keep_default_na=False)
+    except (OSError, ValueError) as e:
+        raise HistoryError(f"{filename}: cannot read testing CSV ({e})")
+    df.columns = df.columns.str.strip()
+    if NAME_COLUMN not in df.columns:
+        raise HistoryError(f"{filename}: required column '{NAME_COLUMN}' not found")
+    names = df[NAME_COLUMN].str.strip()
+    df = df[names != '']
+    names = names[names != '']
+
+    athlete_names = load_athlete_names(store_dir)
+    codes_by_name = {name: code for code, name in enumerate(athlete_names)}
+    for name in names.unique():
+        if name not in codes_by_name:
+            codes_by_name[name] = len(athlete_names)
+            athlete_names.append(name)
+    codes = names.map(codes_by_name).to_numpy(dtype=np.int32)
+
+    # The name dictionary is append-only, so write it first: a crash later on
+    # leaves unused names, never codes that point past the dictionary
+    os.makedirs(store_dir, exist_ok=True)
+    _write_json(os.path.join(store_dir, 'athletes.json'), athlete_names)
+
+    # Write the partition beside the old one, then swap it in
+    final_dir = _partition_dir(store_dir, test_date)
+    tmp_dir = f"{final_dir}.tmp"
+    old_dir = f"{final_dir}.old"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+    np.save(os.path.join(tmp_dir, ATHLETE_FILE), codes)
+    for lift, column in MAX_COLUMNS.items():
+        if column in df.columns:
+            values = parse_max_column(df[column])
+        else:
+            values = np.full(len(df), np.nan, dtype=np.float32)
+        np.save(os.path.join(tmp_dir, LIFT_FILES[lift]), values)
+    measures = {}
+    for column in df.columns:
+        if column == NAME_COLUMN or column in MAX_COLUMNS.values():
+            continue
+        text = df[column].str.strip()
+        if not (text != '').any():
+            continue # e.g. the empty column trailing commas produce
+        stem = _measure_stem(column, set(measures.values()))
+        measures[column] = stem
+        np.save(os.path.join(tmp_dir, f"{stem}.npy"), parse_max_column(text))
+        np.save(os.path.join(tmp_dir, f"{stem}.text.npy"), text.to_numpy(dtype=str))
+    _write_json(os.path.join(tmp_dir, MEASURES_FILE), measures)
+    shutil.rmtree(old_dir, ignore_errors=True)
+    if os.path.exists(final_dir):
+        os.replace(final_dir, old_dir)
+    os.replace(tmp_dir, final_dir)
+    shutil.rmtree(old_dir, ignore_errors=True)
+
+    snapshots = _read_json(os.path.join(store_dir, 'snapshots.json'), {})
+    snapshots[test_date] = {'rows': len(codes), 'source': os.path.basename(filename)}
+    _write_json(os.path.join(store_dir, 'snapshots.json'), snapshots)
+    return len(codes)
+
+# =========================
+# QUERIES
+# =========================
+
+def load_snapshot(test_date, store_dir=HISTORY_DIR):
+    """
+    Return the athletes tested on `test_date` in load_athletes() form, so
+    sheets can be generated from any historical snapshot.
+    """
+    test_date = _check_date(test_date)
+    athlete_names = load_athlete_names(store_dir)
+    codes = _column(store_dir, test_date, ATHLETE_FILE)
+    lifts = {lift: _column(store_dir, test_date, f) for lift, f in LIFT_FILES.items()}
+    athletes = []
+    for i, code in enumerate(codes):
+        maxes = {lift: _as_max(values[i]) for lift, values in lifts.items()}
+        athletes.append({'name': athlete_names[code], 'maxes': maxes})
+    return athletes
+
+def athlete_progression(name, store_dir=HISTORY_DIR):
+    """Return [(test_date, {lift: max or None}), ...] for one athlete, oldest first."""
+    athlete_names = load_athlete_names(store_dir)
+    if name not in athlete_names:
+        raise HistoryError(f"no testing history for '{name}'")
+    code = athlete_names.index(name)
+    progression = []
+    for test_date in list_snapshots(store_dir):
+        rows = np.flatnonzero(_column(store_dir, test_date, ATHLETE_FILE) == code)
+        if not len(rows):
+            continue
+        row = rows[-1] # a repeated name in one CSV: the last row wins
+        maxes = {
+            lift: _as_max(_column(store_dir, test_date, filename)[row])
+            for lift, filename in LIFT_FILES.items()
+        }
+        progression.append((test_date, maxes))
+    return progression
+
+def athlete_measures(name, store_dir=HISTORY_DIR):
+    """
+    Return [(test_date, {column: text}), ...] for one athlete's non-lift
+    columns (push ups, vertical jump, ...), as written in each CSV, oldest first.
+    """
+    athlete_names = load_athlete_names(store_dir)
+    if name not in athlete_names:
+        raise HistoryError(f"no testing history for '{name}'")
+    code = athlete_names.index(name)
+    history = []
+    for test_date in list_snapshots(store_dir):
+        rows = np.flatnonzero(_column(store_dir, test_date, ATHLETE_FILE) == code)
+        if not len(rows):
+            continue
+        row = rows[-1]
+        history.append((test_date, {
+            column: str(_column(store_dir, test_date, f"{stem}.text.npy")[row])
+            for column, stem in _measure_files(store_dir, test_date).items()
+        }))
+    return history
+
+def lift_percentiles(lift, store_dir=HISTORY_DIR, percentiles=DEFAULT_PERCENTILES, test_date=None):
+    """
+    Team percentiles of one lift, or measure column such as 'Push ups', per
+    snapshot (or just `test_date`). Returns {test_date: {'tested': n,
+    percentile: value, ...}}; athletes without a recorded value are left out.
+    """
+    dates = [_check_date(test_date)] if test_date else list_snapshots(store_dir)
+    if lift not in LIFT_FILES and not any(lift in _measure_files(store_dir, d) for d in dates):
+        _check_lift(lift) # raises, listing the lifts
+    result = {}
+    for d in dates:
+        if lift in LIFT_FILES:
+            filename = LIFT_FILES[lift]
+        elif lift in _measure_files(store_dir, d):
+            filename = f"{_measure_files(store_dir, d)[lift]}.npy"
+        else:
+            continue # measure not recorded on this date
+        values = _column(store_dir, d, filename)
+        tested = values[~np.isnan(values)]
+        row = {'tested': int(tested.size)}
+        if tested.size:
+            for p, v in zip(percentiles, np.percentile(tested, percentiles)):
+                row[p] = round(float(v), 1)
+        result[d] = row
+    return result
+
+def _latest_by_athlete(store_dir, test_date, filename, size):
+    """Dense array indexed by athlete code holding each athlete's max on test_date."""
+    by_code = np.full(size, np.nan, dtype=np.float32)
+    by_code[_column(store_dir, test_date, ATHLETE_FILE)] = _column(store_dir, test_date, filename)
+    return by_code
+
+def biggest_gainers(lift, since, until, store_dir=HISTORY_DIR, top=10):
+    """
+    Athletes with the largest gain in `lift` between two snapshots.
+    Returns [(name, before, after, gain), ...], biggest gain first.
+    """
+    filename = LIFT_FILES[_check_lift(lift)]
+    athlete_names = load_athlete_names(store_dir)
+    before = _latest_by_athlete(store_dir, _check_date(since), filename, len(athlete_names))
+    after = _latest_by_athlete(store_dir, _check_date(until), filename, len(athlete_names))
+    gain = after - before
+    tested = np.flatnonzero(~np.isnan(gain))
+    order = tested[np.argsort(-gain[tested], kind='stable')][:top]
+    gainers = []
+    for code in order:
+        b, a = _as_max(before[code]), _as_max(after[code])
+        gainers.append((athlete_names[code], b, a, round(a - b, 6)))
+    return gainers
+
+# =========================
+# MAIN
+# =========================
+
+def _fmt(value):
+    return '-' if value is None else f"{value:g}"
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Store testing history and query progression.")
+    parser.add_argument('--store', default=HISTORY_DIR, help=f"history directory (default: {HISTORY_DIR})")
+    sub = parser.add_subparsers(dest='command')
+    sub.required = True
+
+    p = sub.add_parser('ingest', help="append a testing CSV as one snapshot")
+    p.add_argument('csv')
+    p.add_argument('--date', default=datetime.now().strftime('%Y-%m-%d'),
+                   help="test date, YYYY-MM-DD (default: today)")
+
+    sub.add_parser('snapshots', help="list ingested test dates")
+
+    p = sub.add_parser('progression', help="one athlete's maxes over time")
+    p.add_argument('name')
+
+    p = sub.add_parser('measures', help="one athlete's other test results over time")
+    p.add_argument('name')
+
+    p = sub.add_parser('percentiles', help="team percentiles of a lift or measure per test date")
+    p.add_argument('lift', help=f"{', '.join(LIFT_FILES)} or a measure column name")
+    p.add_argument('--date')
+
+    p = sub.add_parser('gainers', help="biggest gains in a lift between two test dates")
+    p.add_argument('lift', choices=list(LIFT_FILES))
+    p.add_argument('--since', required=True)
+    p.add_argument('--until', required=True)
+    p.add_argument('--top', type=int, default=10)
+
+    args = parser.parse_args(argv)
+
+    try:
+        if args.command == 'ingest':
+            rows = ingest_csv(args.csv, args.date, args.store)
+            print(f"Stored {rows} athlete(s) for {args.date} in {args.store}/")
+        elif args.command == 'snapshots':
+            snapshots = _read_json(os.path.join(args.store, 'snapshots.json'), {})
+            for test_date in sorted(snapshots):
+                info = snapshots[test_date]
+                print(f"{test_date}  {info['rows']:5d} athlete(s)  ({info['source']})")
+        elif args.command == 'progression':
+            lifts = list(LIFT_FILES)
+            print('date        ' + ''.join(f"{lift:>16}" for lift in lifts))
+            for test_date, maxes in athlete_progression(args.name, args.store):
+                print(f"{test_date}  " + ''.join(f"{_fmt(maxes[lift]):>16}" for lift in lifts))
+        elif args.command == 'measures':
+            for test_date, measures in athlete_measures(args.name, args.store):
+                cells = '  '.join(f"{column}: {text or '-'}" for column, text in measures.items())
+                print(f"{test_date}  {cells}")
+        elif args.command == 'percentiles':
+            for test_date, row in lift_percentiles(args.lift, args.store, test_date=args.date).items():
+                cells = '  '.join(f"p{p}={row[p]:g}" for p in DEFAULT_PERCENTILES if p in row)
+                print(f"{test_date}  n={row['tested']:<5d} {cells}")
+        elif args.command == 'gainers':
+            gainers = biggest_gainers(args.lift, args.since, args.until, args.store, args.top)
+            for name, before, after, gain in gainers:
+                print(f"{name:<30} {before:g} → {after:g}  ({gain:+g})")
+    except HistoryError as e:
+        print(f"Error: {e}")
+        return 1
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
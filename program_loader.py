@@ -0,0 +1,511 @@
+import hashlib
+import json
+import os
+import pickle
+import random
+from datetime import date, datetime
+
+from roster import MAX_COLUMNS
+
+try:
+    import tomllib  # Python 3.11+
+except ImportError:
+    try:
+        import tomli as tomllib
+    except ImportError:
+        tomllib = None
+
+# =========================
+# CONFIGURATION
+# =========================
+
+PROGRAM_DIR = 'programs'
+DEFAULT_PROGRAM_FILE = os.path.join(PROGRAM_DIR, 'phs_football.json')
+# Next to this module rather than the working directory: cache files are
+# unpickled, so they must only ever come from a directory we write ourselves
+PROGRAM_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.program_cache')
+
+# Bump whenever the compiled form changes so stale cache files are ignored
+PROGRAM_FORMAT_VERSION = 2
+
+PROGRAM_EXTENSIONS = ('.json', '.toml')
+
+REQUIRED_KEYS = [
+    'mesocycles',
+    'main_lifts',
+    'main_lift_maxes',
+    'random_accessory_count',
+    'bodyweight_exercises',
+    'bodyweight_by_day',
+    'exercise_pools',
+]
+
+REQUIRED_MESOCYCLE_KEYS = [
+    'name',
+    'start_date',
+    'weeks',
+    'main_intensity_min',
+    'main_intensity_max',
+    'main_reps',
+    'main_sets',
+    'accessory_intensity',
+]
+
+# sha256 -> compiled program, so repeated loads in one process are free
+_COMPILED_PROGRAMS = {}
+
+def _loader_digest():
+    """Hash of this module's source, so any change to validation or
+    compilation invalidates the disk cache without a manual version bump."""
+    try:
+        with open(__file__, 'rb') as f:
+            return hashlib.sha256(f.read()).hexdigest()[:16]
+    except OSError:
+        return 'unknown'
+
+LOADER_DIGEST = _loader_digest()
+
+
+class ProgramError(ValueError):
+    """Raised when a program definition file is missing or invalid."""
+
+
+# =========================
+# PARSING & VALIDATION
+# =========================
+
+def _parse_source(path, raw):
+    ext = os.path.splitext(path)[1].lower()
+    if ext == '.json':
+        try:
+            return json.loads(raw.decode('utf-8'))
+        except ValueError as e:
+            raise ProgramError(f"{path}: invalid JSON ({e})")
+    if ext == '.toml':
+        if tomllib is None:
+            raise ProgramError(f"{path}: TOML programs need Python 3.11+ or the 'tomli' package")
+        try:
+            return tomllib.loads(raw.decode('utf-8'))
+        except tomllib.TOMLDecodeError as e:
+            raise ProgramError(f"{path}: invalid TOML ({e})")
+    raise ProgramError(f"{path}: unsupported program file type '{ext}'")
+
+def _parse_date(value, where):
+    if isinstance(value, datetime):
+        return value
+    if isinstance(value, date):
+        return datetime(value.year, value.month, value.day)
+    try:
+        return datetime.strptime(str(value), '%Y-%m-%d')
+    except ValueError:
+        raise ProgramError(f"{where}: start_date must be YYYY-MM-DD, got {value!r}")
+
+def _require_table(value, where):
+    if not isinstance(value, dict):
+        raise ProgramError(f"{where} must be a table/object, got {type(value).__name__}")
+    return value
+
+def _require_list(value, where):
+    if not isinstance(value, list):
+        raise ProgramError(f"{where} must be a list, got {type(value).__name__}")
+    return value
+
+def _require_number(value, where):
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise ProgramError(f"{where} must be a number, got {value!r}")
+    return value
+
+def _require_known_days(table, days, where):
+    unknown = [d for d in table if d not in days]
+    if unknown:
+        raise ProgramError(f"{where}: day(s) with no main lift: {', '.join(map(str, unknown))}")
+
+def _normalize_exercise(spec, where, max_keys):
+    """Validate one exercise spec and fill in the optional keys."""
+    if not isinstance(spec, dict) or not spec.get('name'):
+        raise ProgramError(f"{where}: each exercise needs a 'name'")
+    ex = dict(spec)
+    ex.setdefault('ref_max', None)
+    ex.setdefault('factor', None)
+    if ex['ref_max'] is not None and (not isinstance(ex['ref_max'], str) or ex['ref_max'] not in max_keys):
+        raise ProgramError(
+            f"{where}: '{ex['name']}' references unknown max '{ex['ref_max']}' "
+            f"(expected one of {sorted(max_keys)})"
+        )
+    if ex['factor'] is not None:
+        if isinstance(ex['factor'], bool) or not isinstance(ex['factor'], (int, float)) or ex['factor'] <= 0:
+            raise ProgramError(f"{where}: '{ex['name']}' factor must be a positive number")
+    return ex
+
+def validate_program(data, path='<program>'):
+    """
+    Check a parsed program definition and return a normalized copy.
+    Raises ProgramError describing the first problem found.
+    """
+    if not isinstance(data, dict):
+        raise ProgramError(f"{path}: top level must be a table/object")
+    missing = [k for k in REQUIRED_KEYS if k not in data]
+    if missing:
+        raise ProgramError(f"{path}: missing required keys: {', '.join(missing)}")
+
+    main_lifts = _require_table(data['main_lifts'], f"{path}: main_lifts")
+    days = list(main_lifts.keys())
+    if not days:
+        raise ProgramError(f"{path}: main_lifts must define at least one day")
+    main_lift_maxes = _require_table(data['main_lift_maxes'], f"{path}: main_lift_maxes")
+    for lift, max_key in main_lift_maxes.items():
+        if not isinstance(max_key, str):
+            raise ProgramError(f"{path}: main_lift_maxes.{lift} must be a string, got {max_key!r}")
+    for day, lift in main_lifts.items():
+        if not isinstance(lift, str):
+            raise ProgramError(f"{path}: main_lifts.{day} must be a string, got {lift!r}")
+        if lift not in main_lift_maxes:
+            raise ProgramError(f"{path}: main lift '{lift}' ({day}) has no entry in main_lift_maxes")
+    max_keys = set(main_lift_maxes.values())
+    # Athletes only ever carry the maxes the roster loader reads from the CSV;
+    # any other key would print '@ ______' for every athlete
+    unknown = sorted(max_keys - set(MAX_COLUMNS))
+    if unknown:
+        raise ProgramError(
+            f"{path}: main_lift_maxes uses max(es) the roster does not record: "
+            f"{', '.join(unknown)} (expected one of {', '.join(MAX_COLUMNS)})"
+        )
+
+    for key in ('exercise_pools', 'random_accessory_count'):
+        _require_table(data[key], f"{path}: {key}")
+        missing_days = [d for d in days if d not in data[key]]
+        if missing_days:
+            raise ProgramError(f"{path}: {key} missing days: {', '.join(missing_days)}")
+        _require_known_days(data[key], main_lifts, f"{path}: {key}")
+
+    random_accessory_count = {}
+    for day, count in data['random_accessory_count'].items():
+        if isinstance(count, bool) or not isinstance(count, int) or count < 0:
+            raise ProgramError(
+                f"{path}: random_accessory_count.{day} must be a non-negative integer, got {count!r}"
+            )
+        random_accessory_count[day] = count
+
+    exercise_pools = {}
+    for day, pool in data['exercise_pools'].items():
+        where = f"{path}: exercise_pools.{day}"
+        exercise_pools[day] = [
+            _normalize_exercise(e, where, max_keys) for e in _require_list(pool, where)
+        ]
+
+    bodyweight_names = _require_list(data['bodyweight_exercises'], f"{path}: bodyweight_exercises")
+    if not all(isinstance(n, str) for n in bodyweight_names):
+        raise ProgramError(f"{path}: bodyweight_exercises must be a list of names")
+    bodyweight_exercises = set(bodyweight_names)
+    bodyweight_by_day = {}
+    _require_table(data['bodyweight_by_day'], f"{path}: bodyweight_by_day")
+    _require_known_days(data['bodyweight_by_day'], main_lifts, f"{path}: bodyweight_by_day")
+    for day, names in data['bodyweight_by_day'].items():
+        names = _require_list(names, f"{path}: bodyweight_by_day.{day}")
+        unknown = [n for n in names if not isinstance(n, str) or n not in bodyweight_exercises]
+        if unknown:
+            raise ProgramError(
+                f"{path}: bodyweight_by_day.{day} lists exercises not in bodyweight_exercises: "
+                f"{', '.join(map(str, unknown))}"
+            )
+        bodyweight_by_day[day] = list(names)
+
+    guaranteed = {}
+    guaranteed_specs = _require_table(data.get('guaranteed_accessories', {}),
+                                      f"{path}: guaranteed_accessories")
+    _require_known_days(guaranteed_specs, main_lifts, f"{path}: guaranteed_accessories")
+    for day, specs in guaranteed_specs.items():
+        where = f"{path}: guaranteed_accessories.{day}"
+        guaranteed[day] = [
+            _normalize_exercise(e, where, max_keys) for e in _require_list(specs, where)
+        ]
+
+    mesocycles = []
+    for i, meso in enumerate(_require_list(data['mesocycles'], f"{path}: mesocycles")):
+        where = f"{path}: mesocycles[{i}]"
+        _require_table(meso, where)
+        missing = [k for k in REQUIRED_MESOCYCLE_KEYS if k not in meso]
+        if missing:
+            raise ProgramError(f"{where}: missing keys: {', '.join(missing)}")
+        m = dict(meso)
+        if not isinstance(m['name'], str) or not m['name']:
+            raise ProgramError(f"{where}: name must be a non-empty string")
+        m['start_date'] = _parse_date(m['start_date'], where)
+        if isinstance(m['weeks'], bool) or not isinstance(m['weeks'], int) or m['weeks'] < 2:
+            raise ProgramError(f"{where}: weeks must be an integer of at least 2")
+        for key in ('main_intensity_min', 'main_intensity_max', 'accessory_intensity'):
+            _require_number(m[key], f"{where}: {key}")
+        if not 0 < m['main_intensity_min'] <= m['main_intensity_max']:
+            raise ProgramError(f"{where}: need 0 < main_intensity_min <= main_intensity_max")
+        if m['accessory_intensity'] <= 0:
+            raise ProgramError(f"{where}: accessory_intensity must be positive")
+        m['main_reps'] = str(m['main_reps'])
+        m['main_sets'] = str(m['main_sets'])
+        mesocycles.append(m)
+    if not mesocycles:
+        raise ProgramError(f"{path}: at least one mesocycle is required")
+    phase_names = [m['name'] for m in mesocycles]
+    if len(set(phase_names)) != len(phase_names):
+        raise ProgramError(f"{path}: mesocycle names must be unique")
+
+    fixed_accessories = []
+    fixed_entries = _require_list(data.get('fixed_accessories', []), f"{path}: fixed_accessories")
+    for i, entry in enumerate(fixed_entries):
+        where = f"{path}: fixed_accessories[{i}]"
+        _require_table(entry, where)
+        if not isinstance(entry.get('day'), str) or entry['day'] not in main_lifts:
+            raise ProgramError(f"{where}: unknown day {entry.get('day')!r}")
+        phases = _require_list(entry.get('phases', phase_names), f"{where}: phases")
+        unknown = [p for p in phases if p not in phase_names]
+        if unknown:
+            raise ProgramError(f"{where}: unknown phases: {', '.join(map(str, unknown))}")
+        if 'exercises' not in entry:
+            raise ProgramError(f"{where}: missing key: exercises")
+        exercises = _require_list(entry['exercises'], f"{where}: exercises")
+        fixed_accessories.append({
+            'day': entry['day'],
+            'phases': list(phases),
+            'exercises': [_normalize_exercise(e, where, max_keys) for e in exercises],
+        })
+
+    return {
+        'name': data.get('name', os.path.splitext(os.path.basename(path))[0]),
+        'title': data.get('title', ''),
+        'mesocycles': mesocycles,
+        'main_lifts': dict(main_lifts),
+        'main_lift_maxes': dict(main_lift_maxes),
+        'guaranteed_accessories': guaranteed,
+        'fixed_accessories': fixed_accessories,
+        'random_accessory_count': random_accessory_count,
+        'bodyweight_exercises': bodyweight_exercises,
+        'bodyweight_by_day': bodyweight_by_day,
+        'exercise_pools': exercise_pools,
+    }
+
+# =========================
+# COMPILATION
+# =========================
+
+def choose_phase_accessories_unique(program, mesocycle):
+    """
+    Choose accessories for the whole phase with no repeats across days.
+    Ensures one bodyweight exercise per day, except on days where the phase has
+    fixed accessories, which replace the random picks entirely.
+    Returns dict: day -> list of accessory dicts (number varies by day).
+    """
+    rng = random.Random(100 + mesocycle['index'])
+    main_lift_maxes = program['main_lift_maxes'].values()
+    bodyweight_exercises = program['bodyweight_exercises']
+
+    # Flat pool of all accessories tagged by day, excluding main lifts
+    flat_pool = []
+    for day, exercises in program['exercise_pools'].items():
+        for e in exercises:
+            if e['factor'] is None and e['ref_max'] in main_lift_maxes:
+                continue # skip main lift entries
+            flat_pool.append((day, e))
+
+    # Shuffle to randomize global accessory order
+    rng.shuffle(flat_pool)
+
+    per_day = {d: [] for d in program['main_lifts']}
+    fixed = mesocycle['fixed_accessories']
+    used_names = set()
+
+    # First pass: add phase-specific fixed exercises and bodyweight exercises
+    for day in per_day.keys():
+        if day in fixed:
+            for fixed_ex in fixed[day]:
+                per_day[day].append(fixed_ex)
+                used_names.add(fixed_ex['name'])
+        else:
+            # For all other days/phases, add one bodyweight exercise from the day's available pool
+            if day in program['bodyweight_by_day']:
+                available_bw = [e for day_tag, e in flat_pool
+                               if day_tag == day and e['name'] in program['bodyweight_by_day'][day]
+                               and e['name'] not in used_names]
+                if available_bw:
+                    bw_exercise = rng.choice(available_bw)
+                    per_day[day].append(bw_exercise)
+                    used_names.add(bw_exercise['name'])
+
+    # Second pass: fill remaining slots with random non-bodyweight exercises
+    for day in per_day.keys():
+        target_count = program['random_accessory_count'][day]
+
+        # Fixed exercises already fill the day
+        if day in fixed:
+            continue
+
+        for day_tag, ex in flat_pool:
+            if day_tag != day:
+                continue
+            if ex['name'] in used_names:
+                continue
+            if ex['name'] in bodyweight_exercises:
+                continue  # Skip bodyweight exercises in this pass
+            per_day[day].append(ex)
+            used_names.add(ex['name'])
+            if len(per_day[day]) >= target_count:
+                break
+
+    # Fallback: if any day still needs exercises, allow repeats
+    for day in per_day.keys():
+        target_count = program['random_accessory_count'][day]
+        while len(per_day[day]) < target_count:
+            remaining = [ex for d, ex in flat_pool if d == day]
+            if not remaining:
+                break
+            ex = rng.choice(remaining)
+            per_day[day].append(ex)
+
+    return per_day
+
+def build_phase_layout(program, mesocycle):
+    """
+    Return the exercise rows for a phase, independent of any athlete.
+    Returns list of (day_name, day_label, rows) where each row is a dict with
+    'name', 'kind' ('main', 'guaranteed' or 'accessory'), the exercise 'spec',
+    'is_bodyweight' and 'max_key' (the lift max the row's targets derive from,
+    or None).
+    """
+    phase_accessories = choose_phase_accessories_unique(program, mesocycle)
+    bodyweight_exercises = program['bodyweight_exercises']
+    layout = []
+    for day_name, main_lift in program['main_lifts'].items():
+        rows = [{
+            'name': main_lift,
+            'kind': 'main',
+            'spec': None,
+            'is_bodyweight': False,
+            'max_key': program['main_lift_maxes'][main_lift],
+        }]
+        for acc in program['guaranteed_accessories'].get(day_name, []):
+            rows.append({
+                'name': acc['name'],
+                'kind': 'guaranteed',
+                'spec': acc,
+                'is_bodyweight': False,
+                'max_key': acc['ref_max'] if acc['ref_max'] and acc['factor'] else None,
+            })
+        for acc in phase_accessories[day_name]:
+            is_bodyweight = acc['name'] in bodyweight_exercises
+            if is_bodyweight or not (acc['ref_max'] and acc['factor']):
+                max_key = None
+            else:
+                max_key = acc['ref_max']
+            rows.append({
+                'name': acc['name'],
+                'kind': 'accessory',
+                'spec': acc,
+                'is_bodyweight': is_bodyweight,
+                'max_key': max_key,
+            })
+        layout.append((day_name, day_name.upper(), rows))
+    return layout
+
+def build_dependency_index(program):
+    """
+    Reverse index from each lift max to the target cells derived from it.
+    Returns dict: max key -> list of (mesocycle, day_name, row, week).
+    Bodyweight and unweighted rows depend on no max and are left out.
+    """
+    index = {}
+    for meso in program['mesocycles']:
+        for day_name, _, rows in program['layouts'][meso['index']]:
+            for row in rows:
+                if row['max_key'] is None:
+                    continue
+                for wk in range(1, meso['weeks'] + 1):
+                    index.setdefault(row['max_key'], []).append((meso, day_name, row, wk))
+    return index
+
+def compile_program(data, path='<program>'):
+    """
+    Validate a parsed program definition and compile it into the in-memory
+    form used by the sheet generator: phase-specific fixed accessories are
+    resolved onto each mesocycle, and accessory selection, per-phase layouts
+    and the max dependency index are precomputed.
+    """
+    program = validate_program(data, path)
+
+    for i, meso in enumerate(program['mesocycles']):
+        meso['index'] = i
+        meso['fixed_accessories'] = {}
+    by_name = {m['name']: m for m in program['mesocycles']}
+    for entry in program['fixed_accessories']:
+        for phase_name in entry['phases']:
+            by_name[phase_name]['fixed_accessories'][entry['day']] = entry['exercises']
+
+    program['layouts'] = [build_phase_layout(program, meso) for meso in program['mesocycles']]
+    program['dependency_index'] = build_dependency_index(program)
+    return program
+
+# =========================
+# LOADING
+# =========================
+
+def _read_cached(cache_path):
+    try:
+        with open(cache_path, 'rb') as f:
+            program = pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+        return None
+    return program if isinstance(program, dict) else None
+
+def _write_cached(cache_path, program):
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(program, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        pass # caching is best-effort; a read-only checkout still works
+
+def load_program(path=None, cache_dir=PROGRAM_CACHE_DIR):
+    """
+    Load, validate and compile a program definition (JSON or TOML).
+    Compiled programs are cached in memory and on disk under `cache_dir`,
+    keyed by a hash of the file contents and of this module's source; pass
+    cache_dir=None to skip the disk cache.
+    """
+    if path is None:
+        path = DEFAULT_PROGRAM_FILE
+    try:
+        with open(path, 'rb') as f:
+            raw = f.read()
+    except OSError as e:
+        raise ProgramError(f"{path}: cannot read program file ({e.strerror})")
+
+    digest = hashlib.sha256(raw).hexdigest()
+    if digest in _COMPILED_PROGRAMS:
+        return _COMPILED_PROGRAMS[digest]
+
+    program = None
+    cache_path = None
+    if cache_dir:
+        cache_path = os.path.join(
+            cache_dir, f"{digest}-v{PROGRAM_FORMAT_VERSION}-{LOADER_DIGEST}.pickle"
+        )
+        program = _read_cached(cache_path)
+        if program is not None and program.get('sha256') != digest:
+            program = None
+    if program is None:
+        program = compile_program(_parse_source(path, raw), path)
+        program['sha256'] = digest
+        if cache_path:
+            _write_cached(cache_path, program)
+
+    program['source'] = path
+    _COMPILED_PROGRAMS[digest] = program
+    return program
+
+def load_programs(directory=PROGRAM_DIR, cache_dir=PROGRAM_CACHE_DIR):
+    """Load every program file in `directory`. Returns dict: file stem -> program."""
+    programs = {}
+    for filename in sorted(os.listdir(directory)):
+        stem, ext = os.path.splitext(filename)
+        if ext.lower() in PROGRAM_EXTENSIONS:
+            programs[stem] = load_program(os.path.join(directory, filename), cache_dir)
+    return programs
@@ -0,0 +1,254 @@
+"""
+Roster (testing CSV) loading and pre-flight validation.
+
+Kept free of ReportLab so a roster can be checked in a fraction of the time a
+render takes:
+
+    python roster.py athlete_testing.csv [--json] [--output report.json]
+"""
+import argparse
+import csv
+import json
+import os
+import re
+import sys
+
+import numpy as np
+import pandas as pd
+
+# =========================
+# CONFIGURATION
+# =========================
+
+NAME_COLUMN = 'Name'
+
+# Max key used by the programs -> CSV column holding it
+MAX_COLUMNS = {
+    'Back Squat': 'Squat',
+    'Bench Press': 'Bench Press',
+    'Deadlift': 'Deadlift',
+    'Shoulder Press': 'Shoulder Press',
+}
+
+# Plausible 1RM range in lbs per CSV column; anything outside is flagged
+MAX_RANGES = {
+    'Squat': (45, 1000),
+    'Bench Press': (45, 750),
+    'Deadlift': (45, 1000),
+    'Shoulder Press': (20, 500),
+}
+
+# Values treated as "no max recorded"
+BLANK_VALUES = {'', 'N/A'}
+
+# Suffixes that mean pounds; any other trailing text is suspicious
+POUND_UNITS = {'', 'lb', 'lbs', '#'}
+
+# Characters that cannot appear in file names on at least one common OS
+UNSAFE_NAME_CHARS = r'[/\\:*?"<>|]'
+
+MAX_VALUE_RE = r'^(\d+(?:\.\d+)?)\s*([^\d\s]*)$'
+FIRST_NUMBER_RE = r'(\d+(?:\.\d+)?)' # what parse_max() reads
+
+# =========================
+# LOADING
+# =========================
+
+def parse_max(max_str):
+    if pd.isna(max_str) or max_str == 'N/A' or max_str == '':
+        return None
+    max_str = str(max_str).strip()
+    m = re.search(FIRST_NUMBER_RE, max_str)
+    return float(m.group(1)) if m else None
+
+def safe_name(name):
+    """File-system name used for an athlete's output folder and sheets."""
+    return name.replace(' ', '_')
+
+def load_athletes(filename):
+    if not os.path.exists(filename):
+        print(f"Error: {filename} not found.")
+        return []
+    df = pd.read_csv(filename)
+    df.columns = df.columns.str.strip()
+    athletes = []
+    for _, row in df.iterrows():
+        athletes.append({
+            'name': row[NAME_COLUMN],
+            'maxes': {
+                max_key: parse_max(row.get(column))
+                for max_key, column in MAX_COLUMNS.items()
+            }
+        })
+    return athletes
+
+# =========================
+# VALIDATION
+# =========================
+
+def _row_lines(filename, rows):
+    """
+    File line (1-based) on which each data row starts. read_csv skips blank
+    lines and lets quoted fields span lines, so row index + 2 is not enough.
+    """
+    lines = []
+    try:
+        with open(filename, newline='', encoding='utf-8', errors='replace') as f:
+            reader = csv.reader(f)
+            end = 0
+            for record in reader:
+                start, end = end + 1, reader.line_num
+                if len(record) > 1 or (record and record[0].strip()):
+                    lines.append(start)
+    except (OSError, csv.Error):
+        lines = []
+    lines = lines[1:] # header
+    if len(lines) != rows:
+        return [i + 2 for i in range(rows)]
+    return lines
+
+def _issue(issues, severity, code, line, name, column, value, message):
+    issues.append({
+        'severity': severity,
+        'code': code,
+        'line': int(line) if line is not None else None,
+        'name': name,
+        'column': column,
+        'value': value,
+        'message': message,
+    })
+
+def validate_roster(filename):
+    """
+    Check a testing CSV without rendering anything. Every check runs as a
+    vectorized pass over whole columns; rows are only visited to report them.
+    Returns a report dict with 'errors', 'warnings' and an 'issues' list.
+    """
+    report = {'file': filename, 'rows': 0, 'errors': 0, 'warnings': 0, 'issues': []}
+    issues = report['issues']
+    try:
+        df = pd.read_csv(filename, dtype=str, keep_default_na=False)
+    except (OSError, ValueError) as e:
+        _issue(issues, 'error', 'unreadable_file', None, None, None, None, str(e))
+        report['errors'] = 1
+        return report
+    report['rows'] = len(df)
+    df.columns = df.columns.str.strip()
+    lines = _row_lines(filename, len(df))
+
+    missing = [c for c in [NAME_COLUMN] + list(MAX_COLUMNS.values()) if c not in df.columns]
+    for column in missing:
+        _issue(issues, 'error', 'missing_column', None, None, column, None,
+               f"required column '{column}' not found")
+
+    names = df[NAME_COLUMN].str.strip() if NAME_COLUMN in df.columns else pd.Series([''] * len(df))
+    name_list = names.tolist()
+
+    # ---------- MAX COLUMNS ----------
+
+    for column in MAX_COLUMNS.values():
+        if column not in df.columns:
+            continue
+        raw = df[column].str.strip()
+        blank = raw.isin(BLANK_VALUES)
+        has_number = raw.str.contains(r'\d', regex=True)
+
+        # Plain numbers convert in one C-level pass; only the leftovers need
+        # the slower regex split into number and unit. `value` is the cell's
+        # number when it is written as one number (plus unit); `used` is the
+        # number parse_max() will actually take, which is what gets range-checked
+        plain = raw.str.fullmatch(FIRST_NUMBER_RE)
+        value = pd.to_numeric(raw.where(plain), errors='coerce')
+        used = value.copy()
+        unit = pd.Series('', index=raw.index)
+        other = ~plain & has_number
+        if other.any():
+            parts = raw[other].str.lower().str.extract(MAX_VALUE_RE)
+            value[other] = pd.to_numeric(parts[0], errors='coerce')
+            unit[other] = parts[1].fillna('')
+            used[other] = pd.to_numeric(raw[other].str.extract(FIRST_NUMBER_RE, expand=False),
+                                        errors='coerce')
+
+        checks = [
+            (blank, 'warning', 'missing_max',
+             "no max recorded; sheet will print '@ ______'"),
+            (~blank & ~has_number, 'error', 'unparseable',
+             "no number found; treated as no max"),
+            (has_number & value.isna(), 'warning', 'ambiguous_value',
+             "not a single number; the first number will be used"),
+            (value.notna() & ~unit.isin(POUND_UNITS), 'warning', 'suspicious_unit',
+             "unit suffix is not lbs; value is used as pounds"),
+        ]
+
+        cells = df[column].tolist()
+        for mask, severity, code, message in checks:
+            for i in np.flatnonzero(mask.to_numpy()):
+                _issue(issues, severity, code, lines[i], name_list[i], column, cells[i], message)
+
+        low, high = MAX_RANGES.get(column, (0, float('inf')))
+        out_of_range = used.notna() & ((used < low) | (used > high))
+        for i in np.flatnonzero(out_of_range.to_numpy()):
+            _issue(issues, 'error', 'out_of_range', lines[i], name_list[i], column, cells[i],
+                   f"read as {used.iloc[i]:g} lbs, outside the plausible range {low}-{high} lbs")
+
+    # ---------- NAMES ----------
+
+    if NAME_COLUMN in df.columns:
+        cells = df[NAME_COLUMN].tolist()
+        empty = names == ''
+        for i in np.flatnonzero(empty.to_numpy()):
+            _issue(issues, 'error', 'missing_name', lines[i], None, NAME_COLUMN, cells[i],
+                   "athlete has no name")
+
+        unsafe = names.str.contains(UNSAFE_NAME_CHARS, regex=True)
+        for i in np.flatnonzero(unsafe.to_numpy()):
+            _issue(issues, 'error', 'unsafe_name', lines[i], name_list[i], NAME_COLUMN, cells[i],
+                   "name contains characters not allowed in file names")
+
+        duplicate = ~empty & names.duplicated(keep=False)
+        for i in np.flatnonzero(duplicate.to_numpy()):
+            _issue(issues, 'error', 'duplicate_name', lines[i], name_list[i], NAME_COLUMN, cells[i],
+                   "name appears more than once; later sheets overwrite earlier ones")
+
+        # Different names that map to the same folder, e.g. "A B" / "a_b" on a
+        # case-insensitive file system
+        folders = names.str.replace(' ', '_', regex=False).str.lower()
+        collides = ~empty & ~duplicate & folders.duplicated(keep=False)
+        for i in np.flatnonzero(collides.to_numpy()):
+            _issue(issues, 'error', 'name_collision', lines[i], name_list[i], NAME_COLUMN, cells[i],
+                   f"output folder '{safe_name(name_list[i])}' collides with another athlete's")
+
+    issues.sort(key=lambda x: (x['line'] or 0, x['column'] or ''))
+    report['errors'] = sum(1 for x in issues if x['severity'] == 'error')
+    report['warnings'] = len(issues) - report['errors']
+    return report
+
+# =========================
+# MAIN
+# =========================
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Validate an athlete testing CSV without generating sheets.")
+    parser.add_argument('csv', nargs='?', default='athlete_testing.csv')
+    parser.add_argument('--json', action='store_true', help="print the report as JSON")
+    parser.add_argument('--output', help="also write the JSON report to this file")
+    args = parser.parse_args(argv)
+
+    report = validate_roster(args.csv)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        for issue in report['issues']:
+            where = f"line {issue['line']}" if issue['line'] else args.csv
+            column = f" [{issue['column']}]" if issue['column'] else ''
+            value = f" {issue['value']!r}" if issue['value'] not in (None, '') else ''
+            print(f"{issue['severity'].upper():7} {where}{column}{value}: {issue['message']}")
+        print(f"\n{report['rows']} row(s): {report['errors']} error(s), {report['warnings']} warning(s)")
+    return 1 if report['errors'] else 0
+
+if __name__ == '__main__':
+    sys.exit(main())